@@ -8,7 +8,51 @@ class ArgumentativeComponentAdmin(admin.ModelAdmin):
         "identifier",
         "statement_fragment",
     )
+    list_display = (
+        "identifier",
+        "label",
+        "statement_fragment",
+        "score",
+        "has_manual_annotation",
+    )
+    list_filter = ("label", "has_manual_annotation")
+    # Required to show the statement fragment of each component
+    list_select_related = ("statement",)
+    search_fields = ("identifier", "statement__identifier")
+
+    def get_queryset(self, request):
+        """
+        The attributions can be rather large and aren't part of the list of
+        components, so they are only loaded when a component's form needs them.
+        """
+        return super().get_queryset(request).defer("component_attributions")
+
+
+class ArgumentativeRelationAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "label",
+        "score",
+        "has_manual_annotation",
+    )
+    list_filter = ("label", "has_manual_annotation")
+    # Required to show the components (and their statements) of each relation
+    list_select_related = (
+        "source__statement__author",
+        "source__statement__debate",
+        "target__statement__author",
+        "target__statement__debate",
+    )
+    raw_id_fields = ("source", "target")
+    search_fields = ("source__identifier", "target__identifier")
+
+    def get_queryset(self, request):
+        """
+        The attributions can be rather large and aren't part of the list of
+        relations, so they are only loaded when a relation's form needs them.
+        """
+        return super().get_queryset(request).defer("relation_attributions")
 
 
 admin.site.register(ArgumentativeComponent, ArgumentativeComponentAdmin)
-admin.site.register(ArgumentativeRelation)
+admin.site.register(ArgumentativeRelation, ArgumentativeRelationAdmin)
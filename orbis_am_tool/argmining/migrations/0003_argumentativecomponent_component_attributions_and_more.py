@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-15 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("argmining", "0002_argumentativecomponent_has_manual_annotation_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="argumentativecomponent",
+            name="component_attributions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="A JSON field to store the XAI attribution scores reflecting the importance of each token for the classification of the argumentative component.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="argumentativerelation",
+            name="relation_attributions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="A JSON field to store the XAI attribution scores reflecting the importance of each token, in both source and target components, for the classification of the relation.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-15 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("argmining", "0003_argumentativecomponent_component_attributions_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="argumentativecomponent",
+            index=models.Index(fields=["statement", "start", "end"], name="statement_span"),
+        ),
+    ]
@@ -3,10 +3,12 @@ import xxhash
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils.text import slugify
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
-from debate.models import Statement
-from utils.django import AbstractIdentifierModel
+from debate.models import Debate, Statement
+from utils.django import AbstractIdentifierModel, get_deletion_origin_model
+from utils.text import slugify
 
 
 class ArgumentativeComponent(AbstractIdentifierModel):
@@ -70,6 +72,11 @@ class ArgumentativeComponent(AbstractIdentifierModel):
         help_text="A JSON field to store the XAI attribution scores reflecting the importance of each token for the classification of the argumentative component."
     )
     # -----------------------------------------------------------------------------------------------------------
+
+    class Meta:
+        # The components are mostly read as the (sorted) components of a statement
+        indexes = [models.Index(fields=["statement", "start", "end"], name="statement_span")]
+
     def __str__(self):
         return f"{self.get_label_display()} component in {self.statement}"
 
@@ -86,7 +93,7 @@ class ArgumentativeComponent(AbstractIdentifierModel):
         """
         return self.statement.statement[self.start : self.end]
 
-    def clean(self):
+    def clean_span(self):
         """
         Check that the ``start`` and the ``end`` have some length, are ordered,
         and are inside the statement.
@@ -100,6 +107,12 @@ class ArgumentativeComponent(AbstractIdentifierModel):
                 "The end of the argumentative component can't be larger than the length of the "
                 "statement."
             )
+
+    def clean(self):
+        """
+        Check the span of the component and the uniqueness of the identifier.
+        """
+        self.clean_span()
         super().clean()
 
     def build_identifier(self) -> str:
@@ -121,12 +134,55 @@ class ArgumentativeComponent(AbstractIdentifierModel):
         str
             The identifier.
         """
-        slug = (
-            slugify(self.statement.statement[self.start : self.end])
-            + f"+{self.start}:{self.end}+"
-            + self.statement.identifier
+        # The parts are fed to the hasher as they are, instead of building the
+        # whole string first (it gives the same digest)
+        hasher = xxhash.xxh3_64(seed=settings.XXHASH_SEED)
+        hasher.update(slugify(self.statement.statement[self.start : self.end]))
+        hasher.update(f"+{self.start}:{self.end}+")
+        hasher.update(self.statement.identifier)
+        return hasher.hexdigest()
+
+    @classmethod
+    def bulk_get_or_create(
+        cls, components: list["ArgumentativeComponent"]
+    ) -> list["ArgumentativeComponent"]:
+        """
+        Helper function to save several argumentative components (of one or
+        more statements) at once.
+
+        Saving the components one by one requires a few queries for each of
+        them (to check the identifier, to run the full clean and to insert it).
+        Instead, the identifiers are built and the spans are checked in Python,
+        and all the components are inserted with a single query, skipping those
+        that already exist in the DB (i.e., that have the same identifier).
+
+        Parameters
+        ----------
+        components: list[ArgumentativeComponent]
+            The unsaved argumentative components, with their statement set.
+
+        Returns
+        -------
+        list[ArgumentativeComponent]
+            The argumentative components as they are in the DB, in the same
+            order as they were given. If a component already existed, the one
+            in the DB is returned as is. Either way, the component has the same
+            statement instance it was given with.
+        """
+        for component in components:
+            component.clean_span()
+            component.identifier = component.build_identifier()
+
+        cls.objects.bulk_create(
+            components, ignore_conflicts=True, batch_size=settings.DATABASES_BULK_BATCH_SIZE
+        )
+        saved_components = cls.objects.in_bulk(
+            [component.identifier for component in components], field_name="identifier"
         )
-        return xxhash.xxh3_64_hexdigest(slug, seed=settings.XXHASH_SEED)
+        for component in components:
+            saved_components[component.identifier].statement = component.statement
+        Debate.mark_as_modified(pk__in={component.statement.debate_id for component in components})
+        return [saved_components[component.identifier] for component in components]
 
 
 class ArgumentativeRelation(models.Model):
@@ -199,22 +255,83 @@ class ArgumentativeRelation(models.Model):
         """
         Validate that the from and to components are different.
         """
-        if self.source == self.target:
+        if self.source_id is not None and self.source_id == self.target_id:
             raise ValidationError("The source and target components can't be the same")
 
     def save(self, *args, **kwargs):
         """
         Override save function
 
-        Run the full clean before saving
+        Check the fields (e.g., the label is one of the choices) and that the
+        source and target components are different before saving.
+
+        It doesn't run the full clean, as the validation of the components
+        (which requires a query for each foreign key) and of the unique edge
+        constraint (which requires another query) is enforced by the DB.
         """
-        self.full_clean()
+        self.clean_fields(exclude={"source", "target"})
+        self.clean()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_missing(cls, relations: list["ArgumentativeRelation"]):
+        """
+        Helper function to save several argumentative relations at once.
+
+        It's the same as running ``get_or_create`` for each pair of components
+        of the relations, but with a single query: the relations are checked in
+        Python, and inserted skipping those that already exist in the DB (i.e.,
+        that violate the unique edge constraint), which are kept as they are.
+
+        Parameters
+        ----------
+        relations: list[ArgumentativeRelation]
+            The unsaved argumentative relations.
+        """
+        for relation in relations:
+            relation.clean()
+        cls.objects.bulk_create(
+            relations, ignore_conflicts=True, batch_size=settings.DATABASES_BULK_BATCH_SIZE
+        )
+        if relations:
+            Debate.mark_as_modified(
+                statements__argumentative_components__in={
+                    component_id
+                    for relation in relations
+                    for component_id in (relation.source_id, relation.target_id)
+                }
+            )
+
     @property
     def is_cross_statement(self) -> bool:
         """
         Returns if a relation is cross statement (i.e., the source and target
         argumentative components come from different statements).
         """
-        return self.source.statement != self.target.statement
+        # Comparing the ids avoids fetching the statements of the components
+        return self.source.statement_id != self.target.statement_id
+
+
+@receiver([post_save, post_delete], sender=ArgumentativeComponent)
+def mark_component_debate_as_modified(sender, instance, origin=None, **kwargs):
+    """
+    Marks the debate of a saved or deleted argumentative component as modified,
+    unless it's deleted along with the debate itself. The debates of the
+    relations deleted along with it are marked by the relations.
+    """
+    if get_deletion_origin_model(origin) is not Debate:
+        Debate.mark_as_modified(statements=instance.statement_id)
+
+
+@receiver([post_save, post_delete], sender=ArgumentativeRelation)
+def mark_relation_debates_as_modified(sender, instance, origin=None, **kwargs):
+    """
+    Marks the debates of a saved or deleted argumentative relation as modified
+    (both of them, if it relates components of different debates). When it's
+    deleted along with a debate, the other debate (if any) is still marked, as
+    its graph loses the edge.
+    """
+    Debate.mark_as_modified(
+        origin=origin,
+        statements__argumentative_components__in=[instance.source_id, instance.target_id],
+    )
@@ -2,9 +2,16 @@ from rest_framework import serializers
 
 from argmining.models import ArgumentativeComponent, ArgumentativeRelation
 from debate.models import Statement
+from utils.rest import (
+    CachedFieldsMixin,
+    ChoiceDisplayField,
+    DynamicFieldsMixin,
+    IdentifierHyperlinkedIdentityField,
+    IdentifierHyperlinkedRelatedField,
+)
 
 
-class ArgumentativeRelationSerializer(serializers.ModelSerializer):
+class ArgumentativeRelationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer class for the argumentative relations.
 
@@ -13,19 +20,18 @@ class ArgumentativeRelationSerializer(serializers.ModelSerializer):
     via the ``ArgumentativeComponentSerializer``.
     """
 
-    label = serializers.CharField(
+    label = ChoiceDisplayField(
         read_only=True,
-        source="get_label_display",
         help_text="The label (attack/support) of this relation.",
     )
-    source_component = serializers.HyperlinkedRelatedField(
+    source_component = IdentifierHyperlinkedRelatedField(
         view_name="argmining.rest:component-detail",
         lookup_field="identifier",
         read_only=True,
         source="source",
         help_text="The URL that identifies the source component of this relation.",
     )
-    target_component = serializers.HyperlinkedRelatedField(
+    target_component = IdentifierHyperlinkedRelatedField(
         view_name="argmining.rest:component-detail",
         lookup_field="identifier",
         read_only=True,
@@ -42,7 +48,7 @@ class ArgumentativeRelationSerializer(serializers.ModelSerializer):
     # -----------------------------------------------------------------------------------------------------------
     class Meta:
         model = ArgumentativeRelation
-        fields = [
+        fields = (
             "source_component",
             "target_component",
             "label",
@@ -50,10 +56,12 @@ class ArgumentativeRelationSerializer(serializers.ModelSerializer):
             "has_manual_annotation",
             "is_cross_statement",
             "relation_attributions",
-        ]
+        )
 
 
-class ArgumentativeComponentSerializer(serializers.HyperlinkedModelSerializer):
+class ArgumentativeComponentSerializer(
+    DynamicFieldsMixin, CachedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializer class for the argumentative components of a statement.
 
@@ -68,21 +76,20 @@ class ArgumentativeComponentSerializer(serializers.HyperlinkedModelSerializer):
     can be a part of the ``/api/debate`` REST API.
     """
 
-    url = serializers.HyperlinkedIdentityField(
+    url = IdentifierHyperlinkedIdentityField(
         view_name="argmining.rest:component-detail",
         lookup_field="identifier",
         read_only=True,
         help_text="The URL that identifies this component resource.",
     )
-    statement = serializers.HyperlinkedRelatedField(
+    statement = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:statement-detail",
         lookup_field="identifier",
         read_only=True,
         help_text="The URL that identifies this component's statement resource.",
     )
-    label = serializers.CharField(
+    label = ChoiceDisplayField(
         read_only=True,
-        source="get_label_display",
         help_text="The label (claim or premise) of this component.",
     )
     relations_as_source = ArgumentativeRelationSerializer(
@@ -105,7 +112,7 @@ class ArgumentativeComponentSerializer(serializers.HyperlinkedModelSerializer):
     # -----------------------------------------------------------------------------------------------------------
     class Meta:
         model = ArgumentativeComponent
-        fields = [
+        fields = (
             "url",
             "statement",
             "label",
@@ -117,7 +124,7 @@ class ArgumentativeComponentSerializer(serializers.HyperlinkedModelSerializer):
             "relations_as_target",
             "has_manual_annotation",
             "component_attributions",
-        ]
+        )
 
 
 class PlainStatementSerializer(serializers.Serializer):
@@ -181,31 +188,18 @@ class ArgumentationMiningPipelineSerializer(serializers.Serializer):
     )
 
 
-class ArgumentativeGraphNodeSerializer(serializers.HyperlinkedModelSerializer):
+class ArgumentativeGraphNodeSerializer(ArgumentativeComponentSerializer):
     """
     Serializer for a node of an Argumentative Graph
 
     A node is an argumentative component of a statement, but it won't show the
-    relations of it as they are covered by the edges in the Graph.
+    relations of it as they are covered by the edges in the Graph. It's the
+    same as the ``ArgumentativeComponentSerializer``, with only a subset of its
+    fields.
     """
 
-    url = serializers.HyperlinkedIdentityField(
-        view_name="argmining.rest:component-detail",
-        lookup_field="identifier",
-        read_only=True,
-        help_text="The URL that identifies the component associated to this node.",
-    )
-    statement = serializers.HyperlinkedRelatedField(
-        view_name="debate.rest:statement-detail",
-        lookup_field="identifier",
-        read_only=True,
-        help_text="The URL to the statement's resource of this component.",
-    )
-    label = serializers.CharField(read_only=True, source="get_label_display")
-
-    class Meta:
-        model = ArgumentativeComponent
-        fields = [
+    class Meta(ArgumentativeComponentSerializer.Meta):
+        fields = (
             "url",
             "statement",
             "label",
@@ -214,10 +208,10 @@ class ArgumentativeGraphNodeSerializer(serializers.HyperlinkedModelSerializer):
             "score",
             "statement_fragment",
             "has_manual_annotation",
-        ]
+        )
 
 
-class ArgumentativeGraphEdgeSerializer(serializers.ModelSerializer):
+class ArgumentativeGraphEdgeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for an Edge of an Argumentative Graph
 
@@ -226,8 +220,8 @@ class ArgumentativeGraphEdgeSerializer(serializers.ModelSerializer):
     components parts to make it easier to retrieve.
     """
 
-    label = serializers.CharField(source="get_label_display")
-    source_url = serializers.HyperlinkedRelatedField(
+    label = ChoiceDisplayField()
+    source_url = IdentifierHyperlinkedRelatedField(
         view_name="argmining.rest:component-detail",
         lookup_field="identifier",
         read_only=True,
@@ -239,7 +233,7 @@ class ArgumentativeGraphEdgeSerializer(serializers.ModelSerializer):
         source="source.statement_fragment",
         help_text="The text fragment of the source component.",
     )
-    target_url = serializers.HyperlinkedRelatedField(
+    target_url = IdentifierHyperlinkedRelatedField(
         view_name="argmining.rest:component-detail",
         lookup_field="identifier",
         read_only=True,
@@ -254,7 +248,7 @@ class ArgumentativeGraphEdgeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ArgumentativeRelation
-        fields = [
+        fields = (
             "source_url",
             "target_url",
             "label",
@@ -263,10 +257,12 @@ class ArgumentativeGraphEdgeSerializer(serializers.ModelSerializer):
             "target_text",
             "has_manual_annotation",
             "is_cross_statement",
-        ]
+        )
 
 
-class ArgumentativeGraphStatementSerializer(serializers.HyperlinkedModelSerializer):
+class ArgumentativeGraphStatementSerializer(
+    CachedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializer for a statement of the debate of the Argumentative Graph.
 
@@ -275,27 +271,26 @@ class ArgumentativeGraphStatementSerializer(serializers.HyperlinkedModelSerializ
     already the edges and nodes of the Argumentative Graph.
     """
 
-    url = serializers.HyperlinkedIdentityField(
+    url = IdentifierHyperlinkedIdentityField(
         view_name="debate.rest:statement-detail",
         lookup_field="identifier",
         read_only=True,
         help_text="The URL that identifies the statement.",
     )
-    author = serializers.HyperlinkedRelatedField(
+    author = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:author-detail",
         read_only=True,
         lookup_field="identifier",
         help_text="The URL that identifies the author resource of this statement.",
     )
-    statement_type = serializers.CharField(
+    statement_type = ChoiceDisplayField(
         read_only=True,
-        source="get_statement_type_display",
         help_text=(
             "The type of this statement (if it has any): "
             "position, attacking argument or supporting argument"
         ),
     )
-    related_to = serializers.HyperlinkedRelatedField(
+    related_to = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:statement-detail",
         lookup_field="identifier",
         read_only=True,
@@ -304,7 +299,7 @@ class ArgumentativeGraphStatementSerializer(serializers.HyperlinkedModelSerializ
 
     class Meta:
         model = Statement
-        fields = [
+        fields = (
             "url",
             "author",
             "statement_type",
@@ -313,7 +308,7 @@ class ArgumentativeGraphStatementSerializer(serializers.HyperlinkedModelSerializ
             "related_to",
             "statement_relation_score",
             "has_manual_annotation",
-        ]
+        )
 
 
 class ArgumentativeGraphSerializer(serializers.Serializer):
@@ -324,7 +319,7 @@ class ArgumentativeGraphSerializer(serializers.Serializer):
     components of a given debate.
     """
 
-    debate = serializers.HyperlinkedRelatedField(
+    debate = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:debate-detail",
         lookup_field="identifier",
         read_only=True,
@@ -1,4 +1,4 @@
-from django.urls import path, re_path
+from django.urls import path
 
 from argmining.rest import views
 
@@ -9,13 +9,13 @@ urlpatterns = [
         views.ArgumentMiningPipelineView.as_view(),
         name="argument-mining-pipeline",
     ),
-    re_path(
-        r"graph/(?P<identifier>[0-9a-f]{16})/$",
+    path(
+        "graph/<identifier:identifier>/",
         views.ArgumentativeGraphView.as_view(),
         name="argumentative-graph",
     ),
-    re_path(
-        r"component/(?P<identifier>[0-9a-f]{16})/$",
+    path(
+        "component/<identifier:identifier>/",
         views.ArgumentativeComponentView.as_view(),
         name="component-detail",
     ),
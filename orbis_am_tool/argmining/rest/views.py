@@ -1,11 +1,17 @@
 from django.conf import settings
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, prefetch_related_objects
+from django.http import HttpResponseBase, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from drf_spectacular.openapi import OpenApiParameter, OpenApiResponse, OpenApiTypes
 from drf_spectacular.utils import extend_schema
-from itertools import permutations
+from itertools import islice
 from rest_framework import generics, views, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from typing import Iterator
 
 from argmining.models import ArgumentativeComponent, ArgumentativeRelation
 from argmining.rest import serializers
@@ -13,12 +19,23 @@ from debate.models import Author, Debate, Source, Statement
 from debate.rest.serializers import StatementSerializer
 from torch import device
 
+from utils.cache import CachedInference, cached_inference
 from utils.pipelines import (
     arguments_components_model,
     arguments_relations_model,
+    inference_executor,
+    models_lock,
     statements_classification_model,
     statements_relations_model,
 )
+from utils.rest import (
+    FIELDS_PARAMETER,
+    TRUE_VALUES,
+    AutoPrefetchMixin,
+    get_absolute_url_template,
+    get_choices_display,
+    get_related_lookups,
+)
 
 #from captum.attr import visualization as viz
 from captum.attr import IntegratedGradients, LayerIntegratedGradients
@@ -27,6 +44,7 @@ from captum.attr import IntegratedGradients, LayerIntegratedGradients
 import torch
 import torch.nn as nn
 import json
+import xxhash
 import numpy as np
 
 import matplotlib.pyplot as plt
@@ -36,7 +54,8 @@ from matplotlib.colors import Normalize
 
 # ********************************************* For XAI purposes *********************************************************
 
-device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
+# The input tensors must be in the same device the models are running on
+device = arguments_components_model.device
 #logits = ''
 
 # Forward function used by LayerIntegratedGradients
@@ -65,15 +84,19 @@ def forward_func_sta_class(inputs, token_type_ids=None, position_ids=None, atten
 # Construct input and reference pairs
 def construct_input_ref_pair(text, ref_token_id, sep_token_id, cls_token_id):
     input_ids = arguments_components_model.tokenizer.encode(text, add_special_tokens=True)
-    ref_input_ids = [cls_token_id] + [ref_token_id] * len(input_ids[1:-1]) + [sep_token_id]
-    return torch.tensor([input_ids], device=device), torch.tensor([ref_input_ids], device=device)
+    input_ids = torch.tensor([input_ids], device=device)
+    # The reference keeps the special tokens at the ends, and the rest are the reference token
+    ref_input_ids = torch.full_like(input_ids, ref_token_id)
+    ref_input_ids[:, 0] = cls_token_id
+    ref_input_ids[:, -1] = sep_token_id
+    return input_ids, ref_input_ids
 
 # Token type and reference pairs
 def construct_input_ref_token_type_pair(input_ids):
-    seq_len = input_ids.size(1)
-    token_type_ids = torch.tensor([[0] * seq_len], device=device)
-    ref_token_type_ids = torch.zeros_like(token_type_ids, device=device)
-    return token_type_ids, ref_token_type_ids
+    # Both are zeros (of the shape and device of the inputs), and they're only
+    # read, so the same tensor is used for both, built without a Python list
+    token_type_ids = torch.zeros_like(input_ids)
+    return token_type_ids, token_type_ids
 
 # Attention mask
 def construct_attention_mask(input_ids):
@@ -93,7 +116,8 @@ def construct_embeddings(input_ids, ref_input_ids, token_type_ids=None, ref_toke
 
 # Summarize attributions across embedding dimensions
 def summarize_attributions(attributions):
-    attributions = attributions.sum(dim=-1).squeeze(0)
+    # Half precision attributions (see `MODELS_DTYPE`) can't be converted to numpy
+    attributions = attributions.sum(dim=-1).squeeze(0).float()
     attributions = attributions / torch.norm(attributions)
     return attributions
 
@@ -109,6 +133,9 @@ lig_sta_class = LayerIntegratedGradients(forward_func_sta_class, statements_clas
 label2id_arg_comp = {"Claim": 0, "Premise":1}
 label2id_sta_class = {"Position": 0, "Attack":1, "Support":2}
 
+# The attributions stored when the explanations aren't generated
+EMPTY_ATTRIBUTIONS_JSON = json.dumps([])
+
 # ******************************************************************************************************
 
 @extend_schema(
@@ -118,14 +145,15 @@ label2id_sta_class = {"Position": 0, "Attack":1, "Support":2}
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
             description="The unique identifier of the component to retrieve.",
-        )
+        ),
+        FIELDS_PARAMETER,
     ],
     responses={
         status.HTTP_200_OK: serializers.ArgumentativeComponentSerializer,
         status.HTTP_404_NOT_FOUND: OpenApiResponse(description="The component was not found"),
     },
 )
-class ArgumentativeComponentView(generics.RetrieveAPIView):
+class ArgumentativeComponentView(AutoPrefetchMixin, generics.RetrieveAPIView):
     """
     Argumentative Component View.
 
@@ -196,40 +224,55 @@ class ArgumentMiningPipelineView(views.APIView):
         if not pipeline_data.is_valid():
             return Response(pipeline_data.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        override = request.query_params.get("override", "").lower() in {"true", "1"}
-        xai = request.query_params.get("xai", "").lower() in {"true", "1"}
-
-        # We try to get the Source (if it was given), if it doesn't exist we create it
-        if "source" not in pipeline_data.validated_data:
-            source = None
-        else:
-            source, _ = Source.objects.filter(
-                Q(identifier=pipeline_data.validated_data["source"])
-                | Q(name=pipeline_data.validated_data["source"])
-            ).get_or_create(defaults={"name": pipeline_data.validated_data["source"]})
-
-        # We try to get the Debate, if it doesn't exist we create it
-        debate, _ = Debate.objects.filter(
-            Q(identifier=pipeline_data.validated_data["debate"])
-            | Q(name=pipeline_data.validated_data["debate"])
-        ).get_or_create(defaults={"name": pipeline_data.validated_data["debate"], "source": source})
-
-        # For each of the statements we create them and assign them to the debate
-        statements = []
-        cpt_statements = 0
-        for statement_data in pipeline_data.validated_data["statements"]:
-            # print(f"------------------------------------------- Statement {cpt_statements} ----------------------------------------")
-            # First check if the author exists, or create it
-            author, _ = Author.objects.filter(
-                Q(identifier=statement_data["author"]) | Q(name=statement_data["author"])
-            ).get_or_create(defaults={"name": statement_data["author"]})
-
-            # Then we instantiate an statement, and check if it exists in the DB
-            # (by identifier), if that's the case we retrieve it.
-            statement, created = Statement.objects.get_or_create(
-                statement=statement_data["statement"], debate=debate, author=author
+        override = request.query_params.get("override", "").lower() in TRUE_VALUES
+        xai = request.query_params.get("xai", "").lower() in TRUE_VALUES
+
+        # The debate and its statements are stored in a single transaction (the
+        # models run outside of the transactions, to keep them short)
+        with transaction.atomic():
+            # We try to get the Source (if it was given), if it doesn't exist we create it
+            if "source" not in pipeline_data.validated_data:
+                source = None
+            else:
+                source, _ = Source.objects.filter(
+                    Source.lookup({pipeline_data.validated_data["source"]})
+                ).get_or_create(defaults={"name": pipeline_data.validated_data["source"]})
+
+            # We try to get the Debate, if it doesn't exist we create it
+            debate, _ = Debate.objects.filter(
+                Debate.lookup({pipeline_data.validated_data["debate"]})
+            ).get_or_create(
+                defaults={"name": pipeline_data.validated_data["debate"], "source": source}
             )
+
+            # We get the authors of all the statements at once, creating the ones
+            # that don't exist
+            authors = Author.get_or_create_in_bulk(
+                {
+                    statement_data["author"]
+                    for statement_data in pipeline_data.validated_data["statements"]
+                }
+            )
+
+            # We get (or create) all the statements of the debate at once
+            statements_created = Statement.bulk_get_or_create(
+                debate,
+                [
+                    (statement_data["statement"], authors[statement_data["author"]])
+                    for statement_data in pipeline_data.validated_data["statements"]
+                ],
+            )
+
+        # Keep the statements that have to go through the pipeline
+        statements = []
+        pending_statements = []
+        seen_statements = set()
+        for statement, created in statements_created:
             statements.append(statement)
+            if statement.pk in seen_statements:
+                # A repeated statement is the same instance, analyzed only once
+                continue
+            seen_statements.add(statement.pk)
 
             # If the statement already existed in the database and was
             # automatically annotated (i.e., the statement type is set and is
@@ -243,24 +286,102 @@ class ArgumentMiningPipelineView(views.APIView):
 
                 #print("Nothing to do, don't override existing!")
                 continue
-            # Run the component detection model
+            pending_statements.append(statement)
+
+        # The statement classification doesn't depend on the argumentative
+        # structure, so it runs in the background (for all the statements at
+        # once) along the component detection and relation classification models
+        unannotated_statements = [
+            statement for statement in pending_statements if not statement.has_manual_annotation
+        ]
+        classification_indices = {
+            statement.pk: idx for idx, statement in enumerate(unannotated_statements)
+        }
+        if unannotated_statements:
+            statements_classification_future = CachedInference(
+                statements_classification_model,
+                [statement.statement for statement in unannotated_statements],
+                "statements-classification",
+                executor=inference_executor,
+            )
+
+        # Run the component detection model over all the statements at once,
+        # so the model gets full batches
+        statements_components = cached_inference(
+            arguments_components_model,
+            [statement.statement for statement in pending_statements],
+            "arguments-components",
+        )
+
+        cpt_statements = 0
+        pending_components = []
+        classified_statements = []
+        for statement, statement_components in zip(pending_statements, statements_components):
+            # print(f"------------------------------------------- Statement {cpt_statements} ----------------------------------------")
             components = []
             cpt_statements += 1
-            for i, component in enumerate(arguments_components_model(statement.statement)):
-                #print(f'***** Component {i} ****** : {component}\n')
-                # Only consider components above certain threshold
+
+            # Only consider components above certain threshold, and with a
+            # minimum length (e.g., to avoid components with only single words)
+            # once their leading and trailing spaces are cleaned. The fragment is
+            # sliced once, and stripped locally
+            kept_components = []
+            for component in statement_components:
                 if component["score"] < settings.MINIMUM_COMPONENT_SCORE:
                     continue
-                # print(f'***** Component {i} Not Ignored ******')
+                fragment = statement.statement[component["start"] : component["end"]]
+                stripped_fragment = fragment.lstrip(" ")
+                leading_spaces = len(fragment) - len(stripped_fragment)
+                fragment = stripped_fragment.rstrip(" ")
+                trailing_spaces = len(stripped_fragment) - len(fragment)
+                if len(fragment) < settings.MINIMUM_COMPONENT_LENGTH:
+                    continue
+                start = component["start"] + leading_spaces
+                end = component["end"] - trailing_spaces
+                kept_components.append((component, start, end))
+
+            targets_attributions = {}
+            if xai:
+                # The inputs for the explanations are the same for every
+                # component of the statement, so they're only built once
+                input_ids, ref_input_ids = construct_input_ref_pair(statement.statement, ref_token_id, sep_token_id, cls_token_id)
+                token_type_ids, ref_token_type_ids = construct_input_ref_token_type_pair(input_ids)
+                attention_mask = construct_attention_mask(input_ids)
+
+                # The attributions only depend on the target (i.e., the label of
+                # the component), so they're computed once per label of the
+                # kept components of the statement, all of them in a single batch
+                targets = sorted(
+                    {
+                        label2id_arg_comp[component["entity_group"]]
+                        for component, _, _ in kept_components
+                    }
+                )
+                if targets:
+                    # Compute attributions
+                    with models_lock.exclusive():
+                        targets_component_attributions, delta = lig_arg_comp.attribute(
+                            inputs=input_ids.expand(len(targets), -1),
+                            baselines=ref_input_ids.expand(len(targets), -1),
+                            additional_forward_args=(
+                                token_type_ids.expand(len(targets), -1),
+                                attention_mask.expand(len(targets), -1),
+                            ),
+                            return_convergence_delta=True,
+                            target=targets,
+                            n_steps=settings.XAI_N_STEPS,
+                            internal_batch_size=settings.XAI_INTERNAL_BATCH_SIZE,
+                        )
+                for idx, target in enumerate(targets):
+                    # Summarize attributions
+                    component_attributions_sum = summarize_attributions(targets_component_attributions[idx : idx + 1])
+                    # Delete attributions for [CLS] and [SEP] special tokens, and round them to
+                    # 4 decimals (in place, with a single copy from the device at the end)
+                    component_attributions = component_attributions_sum[1:-1].mul_(10 ** 4).round_().div_(10 ** 4).cpu()
 
-                # ******************************************** Generate explanation attributions for component classification ************************************************************
-                component_attributions = []
-                if xai:
-                    # Create input tensors for model and explanation
-                    input_ids, ref_input_ids = construct_input_ref_pair(statement.statement, ref_token_id, sep_token_id, cls_token_id)
-                    token_type_ids, ref_token_type_ids = construct_input_ref_token_type_pair(input_ids)
-                    attention_mask = construct_attention_mask(input_ids)
-                    # Convert input IDs to tokens for later visualization
+                    # Uncomment to generate visualizations of the attributions
+                    """
+                    # Convert input IDs to tokens for the visualization
                     indices = input_ids[0].detach().tolist()
                     all_tokens = arguments_components_model.tokenizer.convert_ids_to_tokens(indices)
                     # Remove '▁' and re-join subwords
@@ -273,25 +394,6 @@ class ArgumentMiningPipelineView(views.APIView):
                         #else:
                             #cleaned_tokens[-1] += token  # Append subword to the last token
                     #all_tokens = cleaned_tokens
-
-                    # Compute attributions
-                    target = label2id_arg_comp[component['entity_group']] #map the label to a target id to be used by lig
-                    component_attributions, delta = lig_arg_comp.attribute(
-                        inputs=input_ids,
-                        baselines=ref_input_ids,
-                        additional_forward_args=(token_type_ids, attention_mask),
-                        return_convergence_delta=True,
-                        target=target,
-                    )
-
-                    # Summarize attributions
-                    component_attributions_sum = summarize_attributions(component_attributions)
-                    component_attributions = component_attributions_sum[1:-1]# delete attributions for [CLS] and [SEP] special tokens
-                    component_attributions = (component_attributions * 10 ** 4).round() / (10 ** 4) # round them to 4 decimals
-                    component_attributions = component_attributions.numpy()
-
-                    # Uncomment to generate visualizations of the attributions
-                    """
                     # Set up the color map (using a colormap like 'coolwarm')
                     component_attributions_normalized = (component_attributions - np.min(component_attributions)) / (np.max(component_attributions) - np.min(component_attributions))
                     cmap = cm.get_cmap('coolwarm')
@@ -308,72 +410,30 @@ class ArgumentMiningPipelineView(views.APIView):
                     plt.subplots_adjust(left=0.05, right=0.95, top=0.8, bottom=0.2)
                     plt.savefig(f"~/orbis-argument-mining-tool/orbis_am_tool/visuals/comp_attr_vis_highlighted_sent_{target}.png", bbox_inches='tight')
                     """
-                    component_attributions = component_attributions.tolist()
+                    # (serialized once, to store it in db and return in request response)
+                    targets_attributions[target] = json.dumps(component_attributions.tolist())
+
+            for component, start, end in kept_components:
+                # ******************************************** Generate explanation attributions for component classification ************************************************************
+                component_attributions_json = EMPTY_ATTRIBUTIONS_JSON
+                if xai:
+                    target = label2id_arg_comp[component['entity_group']] #map the label to a target id to be used by lig
+                    component_attributions_json = targets_attributions[target]
 
                 # ********************************************************************************************************
 
-                component_attributions_json = json.dumps(component_attributions)  # to store it in db and return in request response
                 component = ArgumentativeComponent(
                     statement=statement,
-                    start=component["start"],
-                    end=component["end"],
+                    start=start,
+                    end=end,
                     label=component["entity_group"],
                     score=component["score"],
                     component_attributions=component_attributions_json,
                 )
-                # Clean leading and trailing spaces from the component
-                leading_spaces = len(component.statement_fragment) - len(
-                    component.statement_fragment.lstrip(" ")
-                )
-                component.start += leading_spaces
-
-                trailing_spaces = len(component.statement_fragment) - len(
-                    component.statement_fragment.rstrip(" ")
-                )
-                component.end -= trailing_spaces
-
-                # Check the component fragment has a minimum length (e.g., to avoid components with only single words)
-                if len(component.statement_fragment) < settings.MINIMUM_COMPONENT_LENGTH:
-                    continue
-
-                component_identifier = component.build_identifier()
-                if ArgumentativeComponent.objects.filter(identifier=component_identifier).exists():
-                    component = ArgumentativeComponent.objects.get(identifier=component_identifier)
-                else:
-                    component.save()
                 components.append(component) # for further use in relation class i guess
 
-            # =====================================================================================================================================================================
-            # ====================================================================  COMP  REL CLASS   =============================================================================
-            # =====================================================================================================================================================================
-
-            # Run relation classification but only put Premises as sources
-            # Claims can be sources or targets
-            pairs_indices = [
-                (i, j)
-                for i, j in permutations(range(len(components)), 2)
-                if components[j].label != ArgumentativeComponent.ArgumentativeComponentLabel.PREMISE
-            ]
-            relations_pairs = [
-                {
-                    "text": components[i].statement_fragment,
-                    "text_pair": components[j].statement_fragment,
-                }
-                for i, j in pairs_indices
-            ]
-            for rid, relation in enumerate(arguments_relations_model(relations_pairs)):
-                # Only consider Attack/Support relations, with a minimum threshold score
-                if (relation["label"] != "noRel" and relation["score"] >= settings.MINIMUM_RELATION_SCORE):
-                    src, tgt = pairs_indices[rid]
-                    # Try to find an existing relationship, if not create it
-                    ArgumentativeRelation.objects.get_or_create(
-                        source=components[src],
-                        target=components[tgt],
-                        defaults=dict(
-                            label=relation["label"],
-                            score=relation["score"],
-                        ),
-                    )
+            # The components of every statement are saved at once, after the loop
+            pending_components.append(components)
 
             # =====================================================================================================================================================================
             # ======================================================================    STA CLASS   ===============================================================================
@@ -384,33 +444,36 @@ class ArgumentMiningPipelineView(views.APIView):
             # automatically classify the statement, that is if it hasn't been
             # manually annotated
             if not statement.has_manual_annotation:
-                statement_classification = statements_classification_model(statement.statement)[0]
+                statement_classification = statements_classification_future.result()[
+                    classification_indices[statement.pk]
+                ]
                 #print(f'***** Statement {i} ****** : {statement_classification}\n')
                 
                 # *********************************************************************************************************
                 
-                statement_attributions = []
+                statement_attributions = EMPTY_ATTRIBUTIONS_JSON
                 if xai:
-                    # Create input tensors for model and explanation
-                    input_ids, ref_input_ids = construct_input_ref_pair(statement.statement, ref_token_id, sep_token_id, cls_token_id)
-                    token_type_ids, ref_token_type_ids = construct_input_ref_token_type_pair(input_ids)
-                    attention_mask = construct_attention_mask(input_ids)
+                    # The input tensors of the statement were already built for
+                    # the explanations of its components (with the same tokenizer)
 
                     # Compute attributions
                     target = label2id_sta_class[statement_classification['label']]
-                    statement_attributions, delta = lig_sta_class.attribute(
-                        inputs=input_ids,
-                        baselines=ref_input_ids,
-                        additional_forward_args=(token_type_ids, attention_mask),
-                        return_convergence_delta=True,
-                        target=target,
-                    )
+                    with models_lock.exclusive():
+                        statement_attributions, delta = lig_sta_class.attribute(
+                            inputs=input_ids,
+                            baselines=ref_input_ids,
+                            additional_forward_args=(token_type_ids, attention_mask),
+                            return_convergence_delta=True,
+                            target=target,
+                            n_steps=settings.XAI_N_STEPS,
+                            internal_batch_size=settings.XAI_INTERNAL_BATCH_SIZE,
+                        )
 
                     # Summarize attributions
                     statement_attributions_sum = summarize_attributions(statement_attributions)
-                    statement_attributions = statement_attributions_sum[1:-1]  # delete attributions for [CLS] and [SEP] special tokens
-                    statement_attributions = (statement_attributions * 10 ** 4).round() / (10 ** 4)  # round them to 4 decimals
-                    statement_attributions = statement_attributions.numpy()
+                    # Delete attributions for [CLS] and [SEP] special tokens, and round them to
+                    # 4 decimals (in place, with a single copy from the device at the end)
+                    statement_attributions = statement_attributions_sum[1:-1].mul_(10 ** 4).round_().div_(10 ** 4).cpu()
                     
                     # Uncomment to generate visualizations of the attributions
                     """
@@ -435,78 +498,155 @@ class ArgumentMiningPipelineView(views.APIView):
                     plt.subplots_adjust(left=0.05, right=0.95, top=0.8, bottom=0.2)
                     plt.savefig(f"~/orbis-argument-mining-tool/orbis_am_tool/visuals/sta_attr_vis_highlighted_sent_{target}.png", bbox_inches='tight')
                     """
-                    statement_attributions = statement_attributions.tolist()
+                    statement_attributions = json.dumps(statement_attributions.tolist())
                     
                 # ********************************************************************************************************
                 
-                statement_attributions = json.dumps(statement_attributions)
                 # prepare the statement object
                 statement.statement_type = statement_classification["label"]
                 statement.statement_classification_score = statement_classification["score"]
                 statement.statement_attributions = statement_attributions
-                statement.save()
+                classified_statements.append(statement)
+
+        # Save the classified statements, and the components of all the
+        # statements at once (reusing those that already exist in the DB), in a
+        # single transaction
+        with transaction.atomic():
+            Statement.bulk_update_fields(
+                classified_statements,
+                ["statement_type", "statement_classification_score", "statement_attributions"],
+            )
+            saved_components = iter(
+                ArgumentativeComponent.bulk_get_or_create(
+                    [component for components in pending_components for component in components]
+                )
+            )
+        relations_pairs = []
+        relations_components = []
+        for components in pending_components:
+            components = [next(saved_components) for _ in components]
+
+            # =====================================================================================================================================================================
+            # ====================================================================  COMP  REL CLASS   =============================================================================
+            # =====================================================================================================================================================================
+
+            # Run relation classification only between compatible labels (by
+            # default, Premises are only sources, and Claims sources or targets)
+            # Pairs of components that are too far apart are not checked
+            # (the possible targets are found once per label, not once per pair)
+            targets_indices = {
+                label: [
+                    j for j, component in enumerate(components) if component.label in targets_labels
+                ]
+                for label, targets_labels in settings.RELATION_COMPATIBLE_LABELS.items()
+            }
+            pairs_indices = [
+                (i, j)
+                for i, component in enumerate(components)
+                for j in targets_indices.get(component.label, ())
+                if i != j
+                and (
+                    settings.MAXIMUM_RELATION_DISTANCE is None
+                    or abs(components[i].start - components[j].start)
+                    <= settings.MAXIMUM_RELATION_DISTANCE
+                )
+            ]
+            # The fragments are sliced once per component, not once per pair
+            fragments = [component.statement_fragment for component in components]
+            relations_pairs.extend(
+                {"text": fragments[i], "text_pair": fragments[j]} for i, j in pairs_indices
+            )
+            relations_components.extend((components[i], components[j]) for i, j in pairs_indices)
+
+        # Run the relation classification model over the pairs of components of
+        # all the statements at once, so the model gets full batches
+        relations = cached_inference(
+            arguments_relations_model, relations_pairs, "arguments-relations"
+        )
+        # Only consider Attack/Support relations, with a minimum threshold score,
+        # and save those that don't exist yet
+        ArgumentativeRelation.bulk_create_missing(
+            [
+                ArgumentativeRelation(
+                    source=source, target=target, label=relation["label"], score=relation["score"]
+                )
+                for (source, target), relation in zip(relations_components, relations)
+                if relation["label"] != "noRel"
+                and relation["score"] >= settings.MINIMUM_RELATION_SCORE
+            ]
+        )
 
         # =====================================================================================================================================================================
         # ====================================================================    STA REL CLASS   =============================================================================
         # =====================================================================================================================================================================
 
+        # Check all the pairs of statements, but only try to classify relations
+        # based on the statement's type. The conditions depend on either the
+        # source or the target statement, so the statements that can be sources
+        # and targets are found once, instead of once per pair
+        sources_indices = [
+            i
+            for i, statement in enumerate(statements)
+            # A statement cannot be a source in a relation unless is an Attack/Support
+            if statement.statement_type
+            in {Statement.StatementType.ATTACK, Statement.StatementType.SUPPORT}
+            # We shouldn't run automatic annotation on a manually annotated
+            # source statement (the target statement on the other hand can be
+            # subject to automatic annotation because the relation might not
+            # exist in that direction)
+            and not statement.has_manual_annotation
+            # If the source statement has already the related class or if it
+            # was assigned the relation score of 0, even if it's not related to
+            # any other statement, we avoid to run it again unless specified by
+            # override
+            and (
+                override
+                or (statement.related_to_id is None and statement.statement_relation_score != 0)
+            )
+            # If the source statement classification score is too low don't
+            # consider it for relation classification
+            and (
+                statement.statement_classification_score is None
+                or statement.statement_classification_score
+                >= settings.MINIMUM_STATEMENT_CLASSIFICATION_SCORE
+            )
+        ]
+        targets_indices = [
+            j
+            for j, statement in enumerate(statements)
+            # A statement cannot be a target in a relation unless is a Position
+            if statement.statement_type == Statement.StatementType.POSITION
+            # If the target statement classification score is too low don't
+            # consider it for relation classification
+            and (
+                statement.statement_classification_score is None
+                or statement.statement_classification_score
+                >= settings.MINIMUM_STATEMENT_CLASSIFICATION_SCORE
+            )
+        ]
+
         statements_text_pairs = []
         statements_pairs = []
-        for i, j in permutations(range(len(statements)), 2):
-            # Check all the pairs of statements, but only try to classify
-            # relations based on the statement's type. I.e., don't classify
-            # statements that are marked as Positions as part of the source, or
-            # statements marked as Attacking/Supporting as part of the target
-            source_statement = statements[i]
-            target_statement = statements[j]
-
-            if source_statement.statement_type not in {
-                Statement.StatementType.ATTACK,
-                Statement.StatementType.SUPPORT,
-            }:
-                # A statement cannot be a source in a relation unless is an Attack/Support
-                continue
-            elif target_statement.statement_type != Statement.StatementType.POSITION:
-                # A statement cannot be a target in a relation unless is a Position
-                continue
-            elif source_statement.has_manual_annotation:
-                # We shouldn't run automatic annotation on a manually annotated
-                # source statement (the target statement on the other hand can
-                # be subject to automatic annotation because the relation
-                # might not exist in that direction)
-                continue
-            elif (
-                source_statement.related_to or source_statement.statement_relation_score == 0
-            ) and not override:
-                # If the source statement has already the related class or if it
-                # was assigned the relation score of 0, even if it's not related
-                # to any other statement, we avoid to run it again unless
-                # specified by override
-                continue
-            elif (
-                source_statement.statement_classification_score is not None
-                and source_statement.statement_classification_score
-                < settings.MINIMUM_STATEMENT_CLASSIFICATION_SCORE
-            ):
-                # If the source statement classification score is too low don't
-                # consider it for relation classification
-                continue
-            elif (
-                target_statement.statement_classification_score is not None
-                and target_statement.statement_classification_score
-                < settings.MINIMUM_STATEMENT_CLASSIFICATION_SCORE
-            ):
-                # If the target statement classification score is too low don't
-                # consider it for relation classification
-                continue
-            statements_text_pairs.append(
-                {"text": source_statement.statement, "text_pair": target_statement.statement}
-            )
-            statements_pairs.append({"source": source_statement, "target": target_statement})
+        # (a statement can't be both, as the types of sources and targets differ)
+        for i in sources_indices:
+            for j in targets_indices:
+                source_statement = statements[i]
+                target_statement = statements[j]
+                statements_text_pairs.append(
+                    {"text": source_statement.statement, "text_pair": target_statement.statement}
+                )
+                statements_pairs.append({"source": source_statement, "target": target_statement})
 
         relevant_major_claims_pairs = []
         relevant_major_claims_text_pairs = []
-        for rid, relation in enumerate(statements_relations_model(statements_text_pairs)):
+        major_claims = {}
+        # The pipeline isn't run at all when there are no pairs to check
+        statements_relations = (
+            statements_relations_model(statements_text_pairs) if statements_text_pairs else []
+        )
+        # The relations of the statements are saved at once, after the loop
+        related_statements = {}
+        for rid, relation in enumerate(statements_relations):
             # Only consider Attack/Support relations, with a minimum threshold score, that
             # match the statement type of the source
             source_statement = statements_pairs[rid]["source"]
@@ -521,8 +661,13 @@ class ArgumentMiningPipelineView(views.APIView):
                 # Those statements that are related are candidates for cross
                 # statement argumentative components relation classification
                 # thus we store the major claims, if they exists
-                source_major_claim = source_statement.get_major_claim()
-                target_major_claim = target_statement.get_major_claim()
+                # (a statement can be part of several pairs, so its major
+                # claim is only looked for once)
+                for related_statement in (source_statement, target_statement):
+                    if related_statement.pk not in major_claims:
+                        major_claims[related_statement.pk] = related_statement.get_major_claim()
+                source_major_claim = major_claims[source_statement.pk]
+                target_major_claim = major_claims[target_statement.pk]
                 if source_major_claim is not None and target_major_claim is not None:
                     relevant_major_claims_pairs.append(
                         {"source": source_major_claim, "target": target_major_claim}
@@ -538,7 +683,11 @@ class ArgumentMiningPipelineView(views.APIView):
                 # to cache the source statement and avoid running it again unless override
                 # is set
                 source_statement.statement_classification_score = 0
-            source_statement.save()
+            related_statements[source_statement.pk] = source_statement
+        Statement.bulk_update_fields(
+            list(related_statements.values()),
+            ["related_to", "statement_relation_score", "statement_classification_score"],
+        )
 
         # =====================================================================================================================================================================
         # =======================================================    MAJOR CLAIMS REL CLASS CROSS STATEMENTS  =================================================================
@@ -546,23 +695,32 @@ class ArgumentMiningPipelineView(views.APIView):
 
         # With all the relevant major claims collected, we want to check the
         # cross statements relations between them
-        for rid, relation in enumerate(arguments_relations_model(relevant_major_claims_text_pairs)):
-            # Only consider Attack/Support relations, with a minimum threshold score
-            if (
-                relation["label"] != "noRel"
-                and relation["score"] >= settings.MINIMUM_RELATION_SCORE
-            ):
-                # Try to find an existing relationship, if not create it
-                ArgumentativeRelation.objects.get_or_create(
-                    source=relevant_major_claims_pairs[rid]["source"],
-                    target=relevant_major_claims_pairs[rid]["target"],
-                    defaults=dict(
-                        label=relation["label"],
-                        score=relation["score"],
-                    ),
+        major_claims_relations = cached_inference(
+            arguments_relations_model, relevant_major_claims_text_pairs, "arguments-relations"
+        )
+        # Only consider Attack/Support relations, with a minimum threshold score,
+        # and save those that don't exist yet
+        ArgumentativeRelation.bulk_create_missing(
+            [
+                ArgumentativeRelation(
+                    source=major_claims_pair["source"],
+                    target=major_claims_pair["target"],
+                    label=relation["label"],
+                    score=relation["score"],
+                )
+                for major_claims_pair, relation in zip(
+                    relevant_major_claims_pairs, major_claims_relations
                 )
+                if relation["label"] != "noRel"
+                and relation["score"] >= settings.MINIMUM_RELATION_SCORE
+            ]
+        )
 
         statements = StatementSerializer(statements, many=True, context={"request": request})
+        # The related objects of the statements (e.g., their components) are
+        # fetched at once, except those the statements already have in memory
+        select_related, prefetch_related, _ = get_related_lookups(statements)
+        prefetch_related_objects(statements.instance, *select_related, *prefetch_related)
 
         return Response(statements.data, status=status.HTTP_200_OK)
 
@@ -579,6 +737,9 @@ class ArgumentMiningPipelineView(views.APIView):
     request=serializers.ArgumentationMiningPipelineSerializer,
     responses={
         status.HTTP_200_OK: serializers.ArgumentativeGraphSerializer,
+        status.HTTP_304_NOT_MODIFIED: OpenApiResponse(
+            description="The graph hasn't changed since the cached version of the request."
+        ),
         status.HTTP_404_NOT_FOUND: OpenApiResponse(description="The debate was not found."),
     },
 )
@@ -589,21 +750,229 @@ class ArgumentativeGraphView(views.APIView):
     Retrieves the whole argumentative graph as a list of nodes and edges of a
     given debate in the database. It provides a different, more complete and
     direct to access, view of the debate.
+
+    The graph can be rather large, so instead of going through model instances
+    and serializers, it's built directly from the values of the queries (only
+    of the columns needed), in the same format as the
+    ``ArgumentativeGraphSerializer``, with the URLs built from templates. When
+    the response is JSON, the graph is streamed as it's read from the DB, in
+    chunks, so it's never fully loaded in memory. The responses have an ``ETag``
+    header of the last modification of the debate, so the clients can
+    revalidate the graph with conditional requests (``If-None-Match``).
     """
 
+    # Number of rows to read at once from the DB
+    chunk_size = 1000
+
+    def build_url(self, view_name: str, identifier: str | None) -> str | None:
+        """
+        Builds the URL of a view for the given identifier (if any).
+        """
+        if identifier is None:
+            return None
+        if view_name not in self.url_templates:
+            self.url_templates[view_name] = get_absolute_url_template(view_name, self.request)
+        prefix, suffix = self.url_templates[view_name]
+        return f"{prefix}{identifier}{suffix}"
+
+    def iter_statements(self, debate: Debate, statements_texts: dict[int, str]) -> Iterator[dict]:
+        """
+        Generates the statements of the graph, keeping their texts in the given
+        dictionary (by primary key), to build the fragments of the components.
+        """
+        statement_types = get_choices_display(Statement, "statement_type")
+        statements = (
+            debate.statements.order_by("pk")
+            .values(
+                "pk",
+                "identifier",
+                "author__identifier",
+                "statement_type",
+                "statement",
+                "statement_classification_score",
+                "related_to__identifier",
+                "statement_relation_score",
+                "has_manual_annotation",
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for statement in statements:
+            statements_texts[statement["pk"]] = statement["statement"]
+            yield {
+                "url": self.build_url("debate.rest:statement-detail", statement["identifier"]),
+                "author": self.build_url(
+                    "debate.rest:author-detail", statement["author__identifier"]
+                ),
+                "statement_type": statement_types.get(
+                    statement["statement_type"], statement["statement_type"]
+                ),
+                "statement": statement["statement"],
+                "statement_classification_score": statement["statement_classification_score"],
+                "related_to": self.build_url(
+                    "debate.rest:statement-detail", statement["related_to__identifier"]
+                ),
+                "statement_relation_score": statement["statement_relation_score"],
+                "has_manual_annotation": statement["has_manual_annotation"],
+            }
+
+    def iter_nodes(self, debate: Debate, statements_texts: dict[int, str]) -> Iterator[dict]:
+        """
+        Generates the nodes (i.e., argumentative components) of the graph.
+        """
+        component_labels = get_choices_display(ArgumentativeComponent, "label")
+        nodes = (
+            ArgumentativeComponent.objects.filter(statement__debate=debate)
+            .order_by("pk")
+            .values(
+                "identifier",
+                "statement_id",
+                "statement__identifier",
+                "label",
+                "start",
+                "end",
+                "score",
+                "has_manual_annotation",
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        for node in nodes:
+            yield {
+                "url": self.build_url("argmining.rest:component-detail", node["identifier"]),
+                "statement": self.build_url(
+                    "debate.rest:statement-detail", node["statement__identifier"]
+                ),
+                "label": component_labels.get(node["label"], node["label"]),
+                "start": node["start"],
+                "end": node["end"],
+                "score": node["score"],
+                "statement_fragment": statements_texts[node["statement_id"]][
+                    node["start"] : node["end"]
+                ],
+                "has_manual_annotation": node["has_manual_annotation"],
+            }
+
+    def iter_edges(self, debate: Debate, statements_texts: dict[int, str]) -> Iterator[dict]:
+        """
+        Generates the edges (i.e., argumentative relations) of the graph.
+        """
+        relation_labels = get_choices_display(ArgumentativeRelation, "label")
+        edges = (
+            ArgumentativeRelation.objects.filter(
+                Q(source__statement__debate=debate) | Q(target__statement__debate=debate)
+            )
+            .order_by("pk")
+            .values(
+                "label",
+                "score",
+                "has_manual_annotation",
+                "source__identifier",
+                "source__start",
+                "source__end",
+                "source__statement_id",
+                "target__identifier",
+                "target__start",
+                "target__end",
+                "target__statement_id",
+            )
+            .iterator(chunk_size=self.chunk_size)
+        )
+        while edges_chunk := list(islice(edges, self.chunk_size)):
+            # The edges can come from components of statements from other debates
+            missing_statements_ids = {
+                edge[f"{end}__statement_id"] for edge in edges_chunk for end in ["source", "target"]
+            } - statements_texts.keys()
+            if missing_statements_ids:
+                statements_texts.update(
+                    Statement.objects.filter(pk__in=missing_statements_ids).values_list(
+                        "pk", "statement"
+                    )
+                )
+            for edge in edges_chunk:
+                yield {
+                    "source_url": self.build_url(
+                        "argmining.rest:component-detail", edge["source__identifier"]
+                    ),
+                    "target_url": self.build_url(
+                        "argmining.rest:component-detail", edge["target__identifier"]
+                    ),
+                    "label": relation_labels.get(edge["label"], edge["label"]),
+                    "score": edge["score"],
+                    "source_text": statements_texts[edge["source__statement_id"]][
+                        edge["source__start"] : edge["source__end"]
+                    ],
+                    "target_text": statements_texts[edge["target__statement_id"]][
+                        edge["target__start"] : edge["target__end"]
+                    ],
+                    "has_manual_annotation": edge["has_manual_annotation"],
+                    "is_cross_statement": (
+                        edge["source__statement_id"] != edge["target__statement_id"]
+                    ),
+                }
+
+    def stream_graph(self, debate: Debate, renderer: JSONRenderer) -> Iterator[bytes]:
+        """
+        Generates the JSON of the graph, piece by piece, each piece rendered by
+        the given renderer, so it's the same as rendering the whole graph.
+        """
+        item_separator, key_separator = (b",", b":") if renderer.compact else (b", ", b": ")
+        statements_texts = {}
+        debate_url = self.build_url("debate.rest:debate-detail", debate.identifier)
+        yield b"{" + renderer.render("debate") + key_separator + renderer.render(debate_url)
+        for key, items in [
+            ("statements", self.iter_statements(debate, statements_texts)),
+            ("nodes", self.iter_nodes(debate, statements_texts)),
+            ("edges", self.iter_edges(debate, statements_texts)),
+        ]:
+            yield item_separator + renderer.render(key) + key_separator + b"["
+            for idx, item in enumerate(items):
+                yield (item_separator if idx > 0 else b"") + renderer.render(item)
+            yield b"]"
+        yield b"}"
+
+    def build_response(self, request, debate: Debate) -> HttpResponseBase:
+        """
+        Builds the response with the graph of the debate, streamed when it's
+        rendered as compact JSON.
+        """
+        # The pieces of the stream are rendered one by one, so they can't be
+        # indented as a whole. An indented graph is rendered in one go, which
+        # keeps the same representation as the other responses
+        renderer = request.accepted_renderer
+        if isinstance(renderer, JSONRenderer) and not renderer.get_indent(
+            request.accepted_media_type, self.get_renderer_context()
+        ):
+            return StreamingHttpResponse(
+                self.stream_graph(debate, renderer), content_type=renderer.media_type
+            )
+
+        statements_texts = {}
+        return Response(
+            {
+                "debate": self.build_url("debate.rest:debate-detail", debate.identifier),
+                "statements": list(self.iter_statements(debate, statements_texts)),
+                "nodes": list(self.iter_nodes(debate, statements_texts)),
+                "edges": list(self.iter_edges(debate, statements_texts)),
+            },
+            status=status.HTTP_200_OK,
+        )
+
     def get(self, request, identifier, format=None):
         debate = get_object_or_404(Debate, identifier=identifier)
-        nodes = ArgumentativeComponent.objects.filter(statement__debate=debate)
-        edges = ArgumentativeRelation.objects.filter(
-            Q(source__statement__debate=debate) | Q(target__statement__debate=debate)
+        self.url_templates = {}
+
+        # The graph only changes when the debate is marked as modified, so the
+        # clients can check if their cached version is still valid (with a
+        # conditional request) without building the graph again
+        etag = quote_etag(
+            xxhash.xxh3_64_hexdigest(
+                f"{debate.last_modified.isoformat()} {request.accepted_media_type} "
+                f"{request.build_absolute_uri()}"
+            )
         )
-        graph = serializers.ArgumentativeGraphSerializer(
-            instance={
-                "debate": debate,
-                "statements": debate.statements.all(),
-                "nodes": nodes,
-                "edges": edges,
-            },
-            context={"request": request},
+        # There's no `Last-Modified` header: its precision is of a second, so a
+        # change in the same second as the cached version would go unnoticed
+        response = get_conditional_response(request, etag=etag) or self.build_response(
+            request, debate
         )
-        return Response(graph.data, status=status.HTTP_200_OK)
+        response.headers["ETag"] = etag
+        return response
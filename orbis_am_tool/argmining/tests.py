@@ -1,3 +1,409 @@
+import json
+import re
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from types import SimpleNamespace
+from unittest import mock
+
+from argmining.models import ArgumentativeComponent, ArgumentativeRelation
+from debate.models import Author, Debate, Statement
+
+
+class ArgumentativeGraphViewTestCase(TestCase):
+    def setUp(self):
+        self.debate = Debate.objects.create(name="Some Debate")
+        author = Author.objects.create(name="Some Author")
+        self.statement = Statement.objects.create(
+            statement="Cars pollute the air, therefore we should ban them.",
+            debate=self.debate,
+            author=author,
+        )
+        self.claim, self.premise = ArgumentativeComponent.bulk_get_or_create(
+            [
+                ArgumentativeComponent(
+                    statement=self.statement,
+                    start=32,
+                    end=50,
+                    label=ArgumentativeComponent.ArgumentativeComponentLabel.CLAIM,
+                    score=0.9,
+                ),
+                ArgumentativeComponent(
+                    statement=self.statement,
+                    start=0,
+                    end=20,
+                    label=ArgumentativeComponent.ArgumentativeComponentLabel.PREMISE,
+                    score=0.8,
+                ),
+            ]
+        )
+        self.url = reverse("argmining.rest:argumentative-graph", args=[self.debate.identifier])
+
+    def get(self, **headers):
+        return self.client.get(self.url, headers=headers)
+
+    @staticmethod
+    def read(response) -> bytes:
+        if response.streaming:
+            return b"".join(response.streaming_content)
+        return response.content
+
+    def test_graph(self):
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response.headers)
+        self.assertNotIn("Last-Modified", response.headers)
+        graph = json.loads(self.read(response))
+        self.assertEqual(len(graph["statements"]), 1)
+        self.assertEqual(
+            {node["statement_fragment"] for node in graph["nodes"]},
+            {"we should ban them", "Cars pollute the air"},
+        )
+        self.assertEqual(graph["edges"], [])
+
+    def test_not_found(self):
+        response = self.client.get(reverse("argmining.rest:argumentative-graph", args=["0" * 16]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_number_of_queries(self):
+        """
+        The graph is built with the same queries, whatever the number of
+        statements, components and relations of the debate, and revalidating
+        it only queries the debate.
+        """
+        with self.assertNumQueries(4):
+            self.read(self.get())
+
+        statement = Statement.objects.create(
+            statement="Cars are needed to go to work.",
+            debate=self.debate,
+            author=self.statement.author,
+        )
+        [claim] = ArgumentativeComponent.bulk_get_or_create(
+            [
+                ArgumentativeComponent(
+                    statement=statement,
+                    start=0,
+                    end=15,
+                    label=ArgumentativeComponent.ArgumentativeComponentLabel.CLAIM,
+                    score=0.9,
+                )
+            ]
+        )
+        ArgumentativeRelation.bulk_create_missing(
+            [
+                ArgumentativeRelation(
+                    source=self.premise,
+                    target=self.claim,
+                    label=ArgumentativeRelation.ArgumentativeRelationLabel.SUPPORT,
+                    score=0.7,
+                ),
+                ArgumentativeRelation(
+                    source=claim,
+                    target=self.claim,
+                    label=ArgumentativeRelation.ArgumentativeRelationLabel.ATTACK,
+                    score=0.8,
+                ),
+            ]
+        )
+        with self.assertNumQueries(4):
+            response = self.get()
+            self.read(response)
+        with self.assertNumQueries(1):
+            self.get(**{"If-None-Match": response.headers["ETag"]})
+
+    def test_conditional_requests(self):
+        etag = self.get().headers["ETag"]
+        response = self.get(**{"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(self.read(response), b"")
+
+        response = self.get(**{"If-None-Match": '"0000000000000000"'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since_is_ignored(self):
+        """
+        The modification times have a precision of a second, which can't tell
+        apart the changes in the same second, so only the ETag is checked.
+        """
+        response = self.get(**{"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_media_type(self):
+        etag = self.get().headers["ETag"]
+        response = self.get(**{"Accept": "text/html", "If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_writes_invalidate_the_graph(self):
+        """
+        Any write to the graph of the debate (through the models, in bulk or
+        not) changes the ETag of the graph.
+        """
+        writes = [
+            lambda: self.statement.save(),
+            lambda: ArgumentativeRelation.bulk_create_missing(
+                [
+                    ArgumentativeRelation(
+                        source=self.premise,
+                        target=self.claim,
+                        label=ArgumentativeRelation.ArgumentativeRelationLabel.SUPPORT,
+                        score=0.7,
+                    )
+                ]
+            ),
+            lambda: ArgumentativeRelation.objects.get().delete(),
+            lambda: self.premise.delete(),
+            lambda: Statement.bulk_update_fields([self.statement], ["statement_type"]),
+        ]
+        for idx, write in enumerate(writes):
+            with self.subTest(write=idx):
+                etag = self.get().headers["ETag"]
+                write()
+                response = self.get(**{"If-None-Match": etag})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_deleting_a_debate_invalidates_the_related_debates(self):
+        """
+        Deleting a debate deletes the relations that cross into other debates,
+        which changes the graphs (and the ETags) of those debates too.
+        """
+        other_debate = Debate.objects.create(name="Another Debate")
+        other_statement = Statement.objects.create(
+            statement="Cars are needed to go to work.",
+            debate=other_debate,
+            author=self.statement.author,
+        )
+        [other_claim] = ArgumentativeComponent.bulk_get_or_create(
+            [
+                ArgumentativeComponent(
+                    statement=other_statement,
+                    start=0,
+                    end=15,
+                    label=ArgumentativeComponent.ArgumentativeComponentLabel.CLAIM,
+                    score=0.9,
+                )
+            ]
+        )
+        ArgumentativeRelation.bulk_create_missing(
+            [
+                ArgumentativeRelation(
+                    source=self.claim,
+                    target=other_claim,
+                    label=ArgumentativeRelation.ArgumentativeRelationLabel.ATTACK,
+                    score=0.7,
+                )
+            ]
+        )
+        url = reverse("argmining.rest:argumentative-graph", args=[other_debate.identifier])
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+        self.assertEqual(len(json.loads(self.read(response))["edges"]), 1)
+
+        self.debate.delete()
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(json.loads(self.read(response))["edges"], [])
+
+
+class ArgumentativeComponentViewTestCase(TestCase):
+    def setUp(self):
+        statement = Statement.objects.create(
+            statement="Cars pollute the air, therefore we should ban them.",
+            debate=Debate.objects.create(name="Some Debate"),
+            author=Author.objects.create(name="Some Author"),
+        )
+        self.components = ArgumentativeComponent.bulk_get_or_create(
+            [
+                ArgumentativeComponent(
+                    statement=statement,
+                    start=start,
+                    end=end,
+                    label=label,
+                    score=0.9,
+                )
+                for start, end, label in [
+                    (32, 50, ArgumentativeComponent.ArgumentativeComponentLabel.CLAIM),
+                    (0, 20, ArgumentativeComponent.ArgumentativeComponentLabel.PREMISE),
+                    (22, 31, ArgumentativeComponent.ArgumentativeComponentLabel.PREMISE),
+                ]
+            ]
+        )
+        self.url = reverse("argmining.rest:component-detail", args=[self.components[0].identifier])
+
+    def add_relations(self, sources):
+        ArgumentativeRelation.bulk_create_missing(
+            [
+                ArgumentativeRelation(
+                    source=source,
+                    target=self.components[0],
+                    label=ArgumentativeRelation.ArgumentativeRelationLabel.SUPPORT,
+                    score=0.7,
+                )
+                for source in sources
+            ]
+        )
+
+    def test_number_of_queries(self):
+        """
+        The relations of the component (along with their components) are
+        prefetched, so the number of queries doesn't depend on them.
+        """
+        self.add_relations(self.components[1:2])
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.add_relations(self.components[2:])
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ArgumentativeRelationTestCase(TestCase):
+    def setUp(self):
+        statement = Statement.objects.create(
+            statement="Cars pollute the air, therefore we should ban them.",
+            debate=Debate.objects.create(name="Some Debate"),
+            author=Author.objects.create(name="Some Author"),
+        )
+        self.claim, self.premise = ArgumentativeComponent.bulk_get_or_create(
+            [
+                ArgumentativeComponent(
+                    statement=statement,
+                    start=start,
+                    end=end,
+                    label=label,
+                    score=0.9,
+                )
+                for start, end, label in [
+                    (32, 50, ArgumentativeComponent.ArgumentativeComponentLabel.CLAIM),
+                    (0, 20, ArgumentativeComponent.ArgumentativeComponentLabel.PREMISE),
+                ]
+            ]
+        )
+
+    def test_save_validates_the_fields(self):
+        """
+        The fields are validated when saving, without querying the components.
+        """
+        for label, score in [("noRel", 0.9), ("Support", "high")]:
+            with self.subTest(label=label, score=score):
+                relation = ArgumentativeRelation(
+                    source=self.premise, target=self.claim, label=label, score=score
+                )
+                with self.assertNumQueries(0), self.assertRaises(ValidationError):
+                    relation.save()
+        self.assertFalse(ArgumentativeRelation.objects.exists())
+
+    def test_save_same_source_and_target(self):
+        relation = ArgumentativeRelation(
+            source=self.claim,
+            target=self.claim,
+            label=ArgumentativeRelation.ArgumentativeRelationLabel.SUPPORT,
+        )
+        with self.assertRaisesMessage(ValidationError, "can't be the same"):
+            relation.save()
+
+
+class FakePipeline:
+    """
+    Stand-in of a Hugging Face pipeline, which gives the result of a function
+    for each of its inputs.
+    """
+
+    def __init__(self, name, predict):
+        self.model = SimpleNamespace(name_or_path=name)
+        self.predict = predict
+
+    def __call__(self, inputs):
+        return [self.predict(input_) for input_ in inputs]
+
+
+def predict_components(text):
+    # The last clause of each statement is its claim, the rest are premises
+    clauses = list(re.finditer(r"[^,.]+", text))
+    return [
+        {
+            "entity_group": "Claim" if idx == len(clauses) - 1 else "Premise",
+            "score": 0.9,
+            "start": clause.start(),
+            "end": clause.end(),
+        }
+        for idx, clause in enumerate(clauses)
+    ]
+
+
+class ArgumentMiningPipelineViewTestCase(TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            "argmining.rest.views",
+            arguments_components_model=FakePipeline("components", predict_components),
+            arguments_relations_model=FakePipeline(
+                "relations", lambda pair: {"label": "Support", "score": 0.9}
+            ),
+            statements_classification_model=FakePipeline(
+                "classification",
+                lambda text: {
+                    "label": (
+                        "Position"
+                        if text.startswith("We")
+                        else "Attack" if " not " in text else "Support"
+                    ),
+                    "score": 0.9,
+                },
+            ),
+            statements_relations_model=FakePipeline(
+                "statements-relations", lambda pair: {"label": "Support", "score": 0.9}
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse("argmining.rest:argument-mining-pipeline")
+
+    def post(self, debate, statements):
+        return self.client.post(
+            self.url,
+            {
+                "debate": debate,
+                "statements": [
+                    {"author": author, "statement": statement} for author, statement in statements
+                ],
+            },
+            content_type="application/json",
+        )
 
-# Create your tests here.
+    def test_number_of_queries(self):
+        """
+        The statements, components and relations are written in bulk, and the
+        response is prefetched, so the number of queries doesn't depend on the
+        number of statements. Only the major claims are queried per statement,
+        for those related to another statement (two in both debates).
+        """
+        for debate, statements in [
+            (
+                "Some Debate",
+                [
+                    ("Some Author", "We should ban the cars, as they pollute the air."),
+                    ("Another Author", "Children breathe that air, and asthma rates rise."),
+                ],
+            ),
+            (
+                "Another Debate",
+                [
+                    ("Third Author", "We should ban the cars, as they pollute the air."),
+                    ("Fourth Author", "Children breathe that air, and asthma rates rise."),
+                    ("Third Author", "Cars are not a problem, as they are cleaner now."),
+                    ("Fourth Author", "Shops would not survive, as nobody could reach them."),
+                ],
+            ),
+        ]:
+            with self.subTest(debate=debate), self.assertNumQueries(35):
+                response = self.post(debate, statements)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()), len(statements))
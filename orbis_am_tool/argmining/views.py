@@ -72,45 +72,39 @@ class AnnFilesTarView(View):
         ]
         tools_config = ContentFile("\n".join(tools_config).encode("utf-8"), name="tools.conf")
 
+        # The components and relations are fetched in a single query each, only
+        # with the columns needed for the annotations, and the offset of each
+        # statement in the full text is used to compute the components' spans
         full_text = ""
-        components = []
-
-        for statement in debate.statements.order_by("pk"):
-            offset = len(full_text)
-            full_text += f"{statement.statement}\n"
-
-            for component in statement.argumentative_components.order_by("pk"):
-                components.append(
-                    {
-                        "id": f"T{component.identifier}",
-                        "label": component.label,
-                        "start": component.start + offset,
-                        "end": component.end + offset,
-                        "fragment": component.statement_fragment,
-                    }
-                )
-
-        relevant_relations = ArgumentativeRelation.objects.filter(
-            Q(source__statement__debate=debate) | Q(target__statement__debate=debate)
+        statements = {}
+        for statement_id, statement_text in debate.statements.order_by("pk").values_list(
+            "pk", "statement"
+        ):
+            statements[statement_id] = (len(full_text), statement_text)
+            full_text += f"{statement_text}\n"
+
+        components = ArgumentativeComponent.objects.filter(statement__debate=debate).order_by(
+            "statement_id", "pk"
         )
-        relations = []
-        for ridx, relation in enumerate(relevant_relations, start=1):
-            relations.append(
-                {
-                    "id": f"R{ridx}",
-                    "label": relation.label,
-                    "source": f"T{relation.source.identifier}",
-                    "target": f"T{relation.target.identifier}",
-                }
-            )
-
         ann_file = [
-            f"{comp['id']}\t{comp['label']} {comp['start']} {comp['end']}\t{comp['fragment']}"
-            for comp in components
+            f"T{identifier}\t{label} {start + statements[statement_id][0]} "
+            f"{end + statements[statement_id][0]}\t{statements[statement_id][1][start:end]}"
+            for identifier, label, start, end, statement_id in components.values_list(
+                "identifier", "label", "start", "end", "statement_id"
+            )
         ]
+
+        # The relations don't have an identifier, so they are numbered in the
+        # order they were created, to have the same ids on every export
+        relations = ArgumentativeRelation.objects.filter(
+            Q(source__statement__debate=debate) | Q(target__statement__debate=debate)
+        ).order_by("pk")
         ann_file += [
-            f"{rel['id']}\t{rel['label']} Source:{rel['source']} Target:{rel['target']}"
-            for rel in relations
+            f"R{ridx}\t{label} Source:T{source} Target:T{target}"
+            for ridx, (label, source, target) in enumerate(
+                relations.values_list("label", "source__identifier", "target__identifier"),
+                start=1,
+            )
         ]
         ann_file = ContentFile("\n".join(ann_file).encode("utf-8"), name=f"{debate.identifier}.ann")
         txt_file = ContentFile(full_text.encode("utf-8"), name=f"{debate.identifier}.txt")
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-15 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debate", "0002_statement_has_manual_annotation_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="statement",
+            name="statement_attributions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="A JSON field to store the XAI attribution scores reflecting the importance of each token in the statement classification process.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="statement",
+            name="statement_relation_attributions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="A JSON field to store the XAI attribution scores reflecting the importance of each token in the statement relation classification process.",
+                null=True,
+            ),
+        ),
+    ]
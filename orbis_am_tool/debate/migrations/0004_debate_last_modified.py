@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-15 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("debate", "0003_statement_attributions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="debate",
+            name="last_modified",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text="The last time the debate (or its argumentative graph) was modified. It's used to validate the cached versions of the graph.",
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -2,11 +2,16 @@ import xxhash
 
 from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils.text import slugify
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from typing import Optional
 
-from utils.django import AbstractIdentifierModel
+from utils.django import AbstractIdentifierModel, get_deletion_origin_model
+from utils.text import slugify
 
 
 class AbstractNameModel(AbstractIdentifierModel):
@@ -54,6 +59,98 @@ class AbstractNameModel(AbstractIdentifierModel):
         """
         return xxhash.xxh3_64_hexdigest(slugify(self.name), seed=settings.XXHASH_SEED)
 
+    @classmethod
+    def lookup(cls, names: set[str]) -> Q:
+        """
+        Helper function to build the filter of the instances of the model whose
+        identifier or name is one of the given names.
+
+        The identifier is built from the name when the instance is created, but
+        it's kept when the instance is renamed, so the name has to be looked up
+        as well (the identifier of a name doesn't find a renamed instance).
+
+        Parameters
+        ----------
+        names: set[str]
+            The identifiers or names of the instances.
+
+        Returns
+        -------
+        Q
+            The filter of the instances.
+        """
+        return Q(identifier__in=names) | Q(name__in=names)
+
+    @classmethod
+    def get_or_create_in_bulk(cls, names: set[str]) -> dict[str, "AbstractNameModel"]:
+        """
+        Helper function to get several instances of the model at once, by their
+        identifier or their name, creating those that don't exist.
+
+        It's the same as running ``get_or_create`` for each of the names, but
+        with a query to get the existing instances (along with those that have
+        the identifiers of the names), and, only if there are missing instances,
+        a query to insert them all and a query to get them back (skipping those
+        that were inserted in the meantime).
+
+        Parameters
+        ----------
+        names: set[str]
+            The identifiers or names of the instances. The missing ones are
+            created with it as the name.
+
+        Returns
+        -------
+        dict[str, AbstractNameModel]
+            A mapping from each of the given names to its instance.
+
+        Raises
+        ------
+        ValidationError
+            If a name is both the identifier of an instance and the name of
+            another one, or if the identifier of a missing name is already taken
+            by another instance (e.g., a name with the same slug), or by
+            another of the missing names.
+        """
+        identifiers = {name: cls(name=name).build_identifier() for name in names}
+        instances = {}
+        existing_identifiers = set()
+        for instance in cls.objects.filter(
+            cls.lookup(names) | Q(identifier__in=identifiers.values())
+        ):
+            existing_identifiers.add(instance.identifier)
+            for key in (instance.identifier, instance.name):
+                if key in names and instances.setdefault(key, instance) != instance:
+                    raise ValidationError("The identifier isn't unique")
+
+        missing_instances = []
+        for name in names:
+            if name in instances:
+                continue
+            # The identifier can't be taken by an instance, nor by another missing name
+            if identifiers[name] in existing_identifiers:
+                raise ValidationError("The identifier isn't unique")
+            existing_identifiers.add(identifiers[name])
+            missing_instances.append(cls(identifier=identifiers[name], name=name))
+        if missing_instances:
+            cls.objects.bulk_create(
+                missing_instances,
+                ignore_conflicts=True,
+                batch_size=settings.DATABASES_BULK_BATCH_SIZE,
+            )
+            saved_instances = cls.objects.in_bulk(
+                [instance.identifier for instance in missing_instances], field_name="identifier"
+            )
+            for instance in missing_instances:
+                saved_instance = saved_instances[instance.identifier]
+                # Another instance with the same identifier was inserted in the
+                # meantime, so this one was skipped
+                if saved_instance.name != instance.name:
+                    raise ValidationError("The identifier isn't unique")
+                instances[instance.name] = saved_instance
+
+        return {name: instances[name] for name in names}
+
 
 class Source(AbstractNameModel):
     """
@@ -103,6 +200,41 @@ class Debate(AbstractNameModel):
         related_name="debates",
         help_text="A source for the debate, in case it has one.",
     )
+    last_modified = models.DateTimeField(
+        auto_now=True,
+        help_text=(
+            "The last time the debate (or its argumentative graph) was modified. "
+            "It's used to validate the cached versions of the graph."
+        ),
+    )
+
+    @classmethod
+    def mark_as_modified(cls, origin: models.Model | models.QuerySet | None = None, **lookups):
+        """
+        Helper function to update the last modification time of some debates,
+        when their argumentative graph is modified (e.g., their statements or
+        argumentative components), without fetching nor saving them.
+
+        It's called by the models of the graph whenever they're written, so
+        there's no need to call it after saving them.
+
+        Parameters
+        ----------
+        origin: models.Model | models.QuerySet | None
+            The origin of the deletion that modified the debates, if any (see
+            ``get_deletion_origin_model``). The debates it deletes are left
+            out, as they're going away.
+        **lookups
+            The filter of the modified debates (e.g., ``pk__in=debates_ids`` or
+            ``statements=statement_id``).
+        """
+        debates = cls.objects.filter(**lookups)
+        if get_deletion_origin_model(origin) is cls:
+            if isinstance(origin, models.QuerySet):
+                debates = debates.exclude(pk__in=origin.values("pk"))
+            else:
+                debates = debates.exclude(pk=origin.pk)
+        debates.update(last_modified=timezone.now())
 
 
 class Author(AbstractNameModel):
@@ -244,8 +376,128 @@ class Statement(AbstractIdentifierModel):
         str
             The identifier.
         """
-        slug = f"{slugify(self.statement)}+{self.debate.identifier}+{self.author.identifier}"
-        return xxhash.xxh3_64_hexdigest(slug, seed=settings.XXHASH_SEED)
+        # The parts are fed to the hasher as they are, instead of building the
+        # whole (possibly long) string first (it gives the same digest)
+        hasher = xxhash.xxh3_64(seed=settings.XXHASH_SEED)
+        hasher.update(slugify(self.statement))
+        hasher.update(f"+{self.debate.identifier}+{self.author.identifier}")
+        return hasher.hexdigest()
+
+    @classmethod
+    def bulk_get_or_create(
+        cls, debate: Debate, statements_authors: list[tuple[str, Author]]
+    ) -> list[tuple["Statement", bool]]:
+        """
+        Helper function to get several statements of a debate at once, by their
+        text and author, creating those that don't exist.
+
+        It's the same as running ``get_or_create`` for each of the statements,
+        but with a query to get the existing statements, and, only if there are
+        missing statements, a query to insert them all and a query to get them
+        back (skipping those that were inserted in the meantime).
+
+        Parameters
+        ----------
+        debate: Debate
+            The debate the statements are part of.
+        statements_authors: list[tuple[str, Author]]
+            The texts of the statements, along their authors.
+
+        Returns
+        -------
+        list[tuple[Statement, bool]]
+            The statements, in the same order as they were given, along whether
+            they were created (i.e., they didn't exist before). A repeated
+            statement is the same instance.
+
+        Raises
+        ------
+        ValidationError
+            If the identifier of a missing statement is already taken by another
+            statement (e.g., a text with the same slug by the same author).
+        """
+        requested_statements = {}
+        for text, author in statements_authors:
+            key = (text, author.pk)
+            if key not in requested_statements:
+                statement = cls(statement=text, debate=debate, author=author)
+                statement.identifier = statement.build_identifier()
+                requested_statements[key] = statement
+
+        # The statements with the identifiers of the requested ones are fetched
+        # as well, to know which identifiers are already taken
+        statements = {}
+        existing_identifiers = set()
+        texts = {text for text, _ in requested_statements}
+        identifiers = [statement.identifier for statement in requested_statements.values()]
+        for statement in cls.objects.filter(
+            Q(debate=debate, statement__in=texts) | Q(identifier__in=identifiers)
+        ):
+            existing_identifiers.add(statement.identifier)
+            if statement.debate_id == debate.pk:
+                statements[(statement.statement, statement.author_id)] = statement
+
+        missing_statements = {}
+        for key, statement in requested_statements.items():
+            if key in statements:
+                continue
+            if statement.identifier in existing_identifiers:
+                raise ValidationError("The identifier isn't unique")
+            missing_statements[key] = statement
+        if missing_statements:
+            cls.objects.bulk_create(
+                missing_statements.values(),
+                ignore_conflicts=True,
+                batch_size=settings.DATABASES_BULK_BATCH_SIZE,
+            )
+            saved_statements = cls.objects.in_bulk(
+                [statement.identifier for statement in missing_statements.values()],
+                field_name="identifier",
+            )
+            for key, statement in missing_statements.items():
+                saved_statement = saved_statements[statement.identifier]
+                # Another statement with the same identifier was inserted in the
+                # meantime, so this one was skipped
+                if (saved_statement.statement, saved_statement.author_id) != key:
+                    raise ValidationError("The identifier isn't unique")
+                statements[key] = saved_statement
+            Debate.mark_as_modified(pk=debate.pk)
+
+        result = []
+        for text, author in statements_authors:
+            statement = statements[(text, author.pk)]
+            # The debate and the author are already known, avoid fetching them
+            statement.debate = debate
+            statement.author = author
+            result.append((statement, (text, author.pk) in missing_statements))
+        return result
+
+    @classmethod
+    def bulk_update_fields(cls, statements: list["Statement"], fields: list[str]):
+        """
+        Helper function to save some fields of several statements at once.
+
+        It's the same as saving each of the statements, as the values of the
+        fields are validated, but with a single query (per batch of
+        ``DATABASES_BULK_BATCH_SIZE``), skipping the checks of the relations and
+        of the identifier (that don't change), which require queries.
+
+        Parameters
+        ----------
+        statements: list[Statement]
+            The statements to save (without repeating them).
+        fields: list[str]
+            The names of the fields to save.
+        """
+        exclude = [
+            field.name
+            for field in cls._meta.fields
+            if field.name not in fields or field.is_relation
+        ]
+        for statement in statements:
+            statement.clean_fields(exclude=exclude)
+        cls.objects.bulk_update(statements, fields, batch_size=settings.DATABASES_BULK_BATCH_SIZE)
+        Debate.mark_as_modified(pk__in={statement.debate_id for statement in statements})
 
     def get_major_claim(self) -> Optional["argmining.models.ArgumentativeComponent"]:  # noqa
         """
@@ -286,6 +538,8 @@ class Statement(AbstractIdentifierModel):
                     "argmining", "ArgumentativeComponent"
                 ).ArgumentativeComponentLabel.CLAIM
             )
+            # The attributions aren't needed (and would be part of the grouping)
+            .defer("component_attributions")
             .annotate(
                 # Get the number of relations of the claims as a target and as a source
                 relations_as_target_count=models.Count("relations_as_target"),
@@ -301,3 +555,14 @@ class Statement(AbstractIdentifierModel):
             )
             .first()  # Return the first claim
         )
+
+
+@receiver([post_save, post_delete], sender=Statement)
+def mark_statement_debate_as_modified(sender, instance, origin=None, **kwargs):
+    """
+    Marks the debate of a saved or deleted statement as modified (e.g., when
+    it's edited in the admin, or deleted along with its author), unless it's
+    deleted along with the debate itself.
+    """
+    if get_deletion_origin_model(origin) is not Debate:
+        Debate.mark_as_modified(pk=instance.debate_id)
@@ -2,19 +2,28 @@ from rest_framework import serializers
 
 from argmining.rest.serializers import ArgumentativeComponentSerializer
 from debate.models import Author, Debate, Source, Statement
+from utils.rest import (
+    CachedFieldsMixin,
+    ChoiceDisplayField,
+    DynamicFieldsMixin,
+    IdentifierHyperlinkedIdentityField,
+    IdentifierHyperlinkedRelatedField,
+)
 
 
-class SourceSerializer(serializers.ModelSerializer):
+class SourceSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for a Debate's ``Source`` model.
     """
 
     class Meta:
         model = Source
-        exclude = ["id"]
+        fields = ("identifier", "name", "description")
 
 
-class DebateSerializer(serializers.HyperlinkedModelSerializer):
+class DebateSerializer(
+    DynamicFieldsMixin, CachedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializer for a Debate.
 
@@ -22,7 +31,7 @@ class DebateSerializer(serializers.HyperlinkedModelSerializer):
     them via their ``identifier`` field.
     """
 
-    url = serializers.HyperlinkedIdentityField(
+    url = IdentifierHyperlinkedIdentityField(
         view_name="debate.rest:debate-detail",
         read_only=True,
         lookup_field="identifier",
@@ -33,7 +42,7 @@ class DebateSerializer(serializers.HyperlinkedModelSerializer):
         required=False,
         help_text="The Source of this debate.",
     )
-    statements = serializers.HyperlinkedRelatedField(
+    statements = IdentifierHyperlinkedRelatedField(
         many=True,
         view_name="debate.rest:statement-detail",
         read_only=True,
@@ -45,29 +54,31 @@ class DebateSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         model = Debate
-        fields = [
+        fields = (
             "url",
             "name",
             "summary",
             "source",
             "statements",
-        ]  # The identifier is already part of the URL
+        )  # The identifier is already part of the URL
 
 
-class AuthorSerializer(serializers.HyperlinkedModelSerializer):
+class AuthorSerializer(
+    DynamicFieldsMixin, CachedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializer for an Author
 
     It overrides the ``url`` parameter so it looks via the ``identifier`` field.
     """
 
-    url = serializers.HyperlinkedIdentityField(
+    url = IdentifierHyperlinkedIdentityField(
         view_name="debate.rest:author-detail",
         read_only=True,
         lookup_field="identifier",
         help_text="The URL that identifies this author resource",
     )
-    statements = serializers.HyperlinkedRelatedField(
+    statements = IdentifierHyperlinkedRelatedField(
         many=True,
         view_name="debate.rest:statement-detail",
         read_only=True,
@@ -77,22 +88,24 @@ class AuthorSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
         model = Author
-        fields = [
+        fields = (
             "url",
             "name",
             "statements",
-        ]  # Don't provide the real user and the identifier is already in the ULR
+        )  # Don't provide the real user and the identifier is already in the ULR
 
 
-class StatementSerializer(serializers.HyperlinkedModelSerializer):
+class StatementSerializer(
+    DynamicFieldsMixin, CachedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
     """
     Serializer of a Statement.
 
     It has pointers to the debate and the author it belongs to, using their
     corresponding ``identifier`` field.
 
-    It displays the ``statement_type`` via the ``get_FOO_display`` function to
-    show the "human readable" version of it.
+    It displays the ``statement_type`` via a ``ChoiceDisplayField`` to show the
+    "human readable" version of it.
 
     It has an hyperlink to the related statement, if there's one, and a list of
     all the statements that are related to it. In both cases it uses the
@@ -103,27 +116,26 @@ class StatementSerializer(serializers.HyperlinkedModelSerializer):
     their API, thus having indirect access to the relationships.
     """
 
-    url = serializers.HyperlinkedIdentityField(
+    url = IdentifierHyperlinkedIdentityField(
         view_name="debate.rest:statement-detail",
         read_only=True,
         lookup_field="identifier",
         help_text="The URL that identifies this statement resource.",
     )
-    debate = serializers.HyperlinkedRelatedField(
+    debate = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:debate-detail",
         read_only=True,
         lookup_field="identifier",
         help_text="The URL that identifies the debate resource of this statement.",
     )
-    author = serializers.HyperlinkedRelatedField(
+    author = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:author-detail",
         read_only=True,
         lookup_field="identifier",
         help_text="The URL that identifies the author resource of this statement.",
     )
-    statement_type = serializers.CharField(
+    statement_type = ChoiceDisplayField(
         read_only=True,
-        source="get_statement_type_display",
         help_text=(
             "The type of this statement (if it has any): "
             "position, attacking argument or supporting argument"
@@ -134,7 +146,7 @@ class StatementSerializer(serializers.HyperlinkedModelSerializer):
         read_only=True,
         help_text="The list of argumentative components that are part of this statement.",
     )
-    related_to = serializers.HyperlinkedRelatedField(
+    related_to = IdentifierHyperlinkedRelatedField(
         view_name="debate.rest:statement-detail",
         lookup_field="identifier",
         read_only=True,
@@ -143,7 +155,7 @@ class StatementSerializer(serializers.HyperlinkedModelSerializer):
             "which this statement is related to."
         ),
     )
-    related_statements = serializers.HyperlinkedRelatedField(
+    related_statements = IdentifierHyperlinkedRelatedField(
         many=True,
         view_name="debate.rest:statement-detail",
         read_only=True,
@@ -169,7 +181,7 @@ class StatementSerializer(serializers.HyperlinkedModelSerializer):
     # -----------------------------------------------------------------------------------------------------------
     class Meta:
         model = Statement
-        fields = [
+        fields = (
             "url",
             "debate",
             "author",
@@ -183,4 +195,4 @@ class StatementSerializer(serializers.HyperlinkedModelSerializer):
             "has_manual_annotation",
             "statement_attributions",
             "statement_relation_attributions",
-        ]  # The identifier is already part of the URL
+        )  # The identifier is already part of the URL
@@ -4,6 +4,7 @@ from rest_framework import generics, status
 
 from debate.models import Author, Debate, Statement
 from debate.rest import serializers
+from utils.rest import FIELDS_PARAMETER, AutoPrefetchMixin
 
 
 @extend_schema(
@@ -13,14 +14,15 @@ from debate.rest import serializers
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
             description="The unique identifier of the author to retrieve.",
-        )
+        ),
+        FIELDS_PARAMETER,
     ],
     responses={
         status.HTTP_200_OK: serializers.AuthorSerializer,
         status.HTTP_404_NOT_FOUND: OpenApiResponse(description="The author was not found."),
     },
 )
-class AuthorView(generics.RetrieveAPIView):
+class AuthorView(AutoPrefetchMixin, generics.RetrieveAPIView):
     """
     Author View
 
@@ -39,14 +41,15 @@ class AuthorView(generics.RetrieveAPIView):
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
             description="The unique identifier of the debate to retrieve.",
-        )
+        ),
+        FIELDS_PARAMETER,
     ],
     responses={
         status.HTTP_200_OK: serializers.DebateSerializer,
         status.HTTP_404_NOT_FOUND: OpenApiResponse(description="The debate was not found."),
     },
 )
-class DebateView(generics.RetrieveAPIView):
+class DebateView(AutoPrefetchMixin, generics.RetrieveAPIView):
     """
     Debate View
 
@@ -65,14 +68,15 @@ class DebateView(generics.RetrieveAPIView):
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
             description="The unique identifier of the statement to retrieve.",
-        )
+        ),
+        FIELDS_PARAMETER,
     ],
     responses={
         status.HTTP_200_OK: serializers.StatementSerializer,
         status.HTTP_404_NOT_FOUND: OpenApiResponse(description="The statement was not found."),
     },
 )
-class StatementView(generics.RetrieveAPIView):
+class StatementView(AutoPrefetchMixin, generics.RetrieveAPIView):
     """
     Statement View
 
@@ -1,3 +1,167 @@
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.utils.text import slugify as django_slugify
 
-# Create your tests here.
+from debate.models import Author, Debate, Statement
+from utils.text import slugify
+
+
+class SlugifyTestCase(SimpleTestCase):
+    def test_same_as_django(self):
+        """
+        The slugs are part of the stored identifiers, so the fast version must
+        give exactly the same results as Django's.
+        """
+        for value in [
+            "",
+            "Cars pollute the air, therefore we should ban them.",
+            "  Leading and trailing spaces  ",
+            "Multiple   spaces\tand\nnew lines",
+            "dashes -- and __ underscores_",
+            "-_ Separators at the ends _-",
+            "Ünïcödé àccénts, ñ and ß",
+            "Ligatures: ﬁ ﬂ, and fullwidth: ＡＢＣ",
+            "Non latin: Αθήνα, Москва, 東京",
+            "Symbols: 50% off! $100 & <tags> @user #tag",
+            "Emojis 😀 and math ∑ √",
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(slugify(value), django_slugify(value))
+
+
+class AbstractNameModelTestCase(TestCase):
+    def test_lookup(self):
+        author = Author.objects.create(name="Some Author")
+        for value in ["Some Author", author.identifier]:
+            with self.subTest(value=value):
+                self.assertEqual(Author.objects.get(Author.lookup({value})), author)
+        self.assertFalse(Author.objects.filter(Author.lookup({"Another Author"})).exists())
+
+    def test_lookup_renamed(self):
+        """
+        The identifier of a renamed instance is kept, so it's found by its new
+        name and by its identifier, but not by its old name.
+        """
+        author = Author.objects.create(name="Old Name")
+        identifier = author.identifier
+        author.name = "New Name"
+        author.save()
+        self.assertEqual(author.identifier, identifier)
+        for value in ["New Name", identifier]:
+            with self.subTest(value=value):
+                self.assertEqual(Author.objects.get(Author.lookup({value})), author)
+        self.assertFalse(Author.objects.filter(Author.lookup({"Old Name"})).exists())
+
+    def test_get_or_create_in_bulk(self):
+        existing = Author.objects.create(name="Existing")
+        renamed = Author.objects.create(name="Before")
+        renamed.name = "After"
+        renamed.save()
+
+        authors = Author.get_or_create_in_bulk(
+            {"Existing", existing.identifier, "After", "Missing"}
+        )
+        self.assertEqual(authors["Existing"], existing)
+        self.assertEqual(authors[existing.identifier], existing)
+        self.assertEqual(authors["After"], renamed)
+        missing = authors["Missing"]
+        self.assertIsNotNone(missing.pk)
+        self.assertEqual(missing.name, "Missing")
+        self.assertEqual(missing.identifier, missing.build_identifier())
+        self.assertEqual(Author.objects.count(), 3)
+
+        # Running it again doesn't create anything
+        self.assertEqual(Author.get_or_create_in_bulk({"Missing"}), {"Missing": missing})
+        self.assertEqual(Author.objects.count(), 3)
+
+    def test_get_or_create_in_bulk_identifier_clash(self):
+        """
+        A name that would be mapped to more than one instance, or whose
+        identifier is taken by another instance, can't be got nor created.
+        """
+        author = Author.objects.create(name="Some Author")
+        other_author = Author.objects.create(name=author.identifier)
+        for names in [
+            # Same slug as an existing author
+            {"some author"},
+            # Same slug as another of the missing names
+            {"Another Author", "another author"},
+            # Identifier of an author, and name of another one
+            {author.identifier},
+        ]:
+            with self.subTest(names=names):
+                with self.assertRaisesMessage(ValidationError, "The identifier isn't unique"):
+                    Author.get_or_create_in_bulk(names)
+        self.assertEqual(set(Author.objects.all()), {author, other_author})
+
+
+class StatementTestCase(TestCase):
+    def setUp(self):
+        self.debate = Debate.objects.create(name="Some Debate")
+        self.author = Author.objects.create(name="Some Author")
+        self.other_author = Author.objects.create(name="Another Author")
+
+    def test_bulk_get_or_create(self):
+        existing = Statement.objects.create(
+            statement="An existing statement.", debate=self.debate, author=self.author
+        )
+
+        result = Statement.bulk_get_or_create(
+            self.debate,
+            [
+                ("An existing statement.", self.author),
+                ("A new statement.", self.author),
+                ("A new statement.", self.other_author),
+                ("A new statement.", self.author),
+            ],
+        )
+        self.assertEqual([created for _, created in result], [False, True, True, True])
+        statements = [statement for statement, _ in result]
+        self.assertEqual(statements[0], existing)
+        # A repeated statement is the same instance
+        self.assertIs(statements[1], statements[3])
+        self.assertNotEqual(statements[1], statements[2])
+        for statement, (text, author) in zip(
+            statements[1:3],
+            [("A new statement.", self.author), ("A new statement.", self.other_author)],
+        ):
+            self.assertIsNotNone(statement.pk)
+            self.assertEqual(statement.statement, text)
+            self.assertEqual(statement.author, author)
+            self.assertEqual(statement.debate, self.debate)
+            self.assertEqual(statement.identifier, statement.build_identifier())
+        self.assertEqual(Statement.objects.count(), 3)
+
+        # Running it again doesn't create anything
+        result = Statement.bulk_get_or_create(self.debate, [("A new statement.", self.author)])
+        self.assertEqual(result, [(statements[1], False)])
+        self.assertEqual(Statement.objects.count(), 3)
+
+    def test_bulk_get_or_create_identifier_clash(self):
+        """
+        A text with the same slug as an existing statement (of the same author
+        in the same debate) has its identifier, so it can't be created.
+        """
+        Statement.objects.create(statement="Ban the cars!", debate=self.debate, author=self.author)
+        with self.assertRaisesMessage(ValidationError, "The identifier isn't unique"):
+            Statement.bulk_get_or_create(self.debate, [("ban the cars", self.author)])
+        self.assertEqual(Statement.objects.count(), 1)
+
+        # The same text by another author is a different statement
+        [(statement, created)] = Statement.bulk_get_or_create(
+            self.debate, [("ban the cars", self.other_author)]
+        )
+        self.assertTrue(created)
+        self.assertEqual(statement.statement, "ban the cars")
+
+    def test_bulk_get_or_create_marks_debate_as_modified(self):
+        last_modified = self.debate.last_modified
+        Statement.bulk_get_or_create(self.debate, [("A new statement.", self.author)])
+        self.debate.refresh_from_db()
+        self.assertGreater(self.debate.last_modified, last_modified)
+
+        # Nothing is written when the statements exist
+        last_modified = self.debate.last_modified
+        Statement.bulk_get_or_create(self.debate, [("A new statement.", self.author)])
+        self.debate.refresh_from_db()
+        self.assertEqual(self.debate.last_modified, last_modified)
@@ -4,6 +4,8 @@ set -ex
 
 python manage.py migrate
 
+python manage.py createcachetable
+
 python manage.py collectstatic --noinput --clear
 
 # The `|| true` is to avoid the script failing if the superuser is already set
@@ -13,4 +15,5 @@ gunicorn orbis_am_tool.wsgi \
     --preload \
     --bind 0.0.0.0:8000 \
     --workers ${GUNICORN_WORKERS:-2} \
+    --threads ${GUNICORN_THREADS:-1} \
     --timeout ${GUNICORN_TIMEOUT:-300}
\ No newline at end of file
@@ -92,6 +92,34 @@ DATABASES = {
     }
 }
 
+# Maximum number of rows inserted by each query of the bulk creations (e.g., of
+# the components of a debate), so large debates don't build huge queries. Set
+# it to `None` to insert all the rows at once (when the DB allows it).
+DATABASES_BULK_BATCH_SIZE = 1000
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/ref/settings/#caches
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # The results of the models are kept in the memory of each worker. They
+    # can be stored in the DB instead, to share them by all the workers and
+    # keep them across restarts, with the `DatabaseCache` backend (e.g., with
+    # a "models_cache" location, whose table is created by `createcachetable`).
+    # But it has no bulk operations, so each result that's missing costs three
+    # queries (a count, a select and an insert) on top of running the model.
+    # The relations have a result per pair of components of a statement, so
+    # the first run over a debate can add thousands of queries
+    "models": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "models",
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -141,6 +169,10 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Django REST Framework
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "utils.renderers.OrjsonRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -170,6 +202,10 @@ ARGUMENTS_COMPONENT_MODEL_STRIDE = 8
 
 ARGUMENTS_RELATIONS_MODEL = "orbis-marianne/deberta-v3-rel-class"
 ARGUMENTS_RELATIONS_MODEL_MAX_LENGTH = 256
+# The relations model runs over every pair of argumentative components of a
+# statement (i.e., quadratic on the number of components), but each pair is
+# rather short, so it's worth running it on larger batches than the rest
+ARGUMENTS_RELATIONS_MODEL_BATCH_SIZE = 16
 
 STATEMENTS_CLASSIFICATION_MODEL = "orbis-marianne/deberta-v3-sta-class"
 STATEMENTS_CLASSIFICATION_MODEL_MAX_LENGTH = 256
@@ -185,5 +221,74 @@ MINIMUM_RELATION_SCORE = 0.75#0.90
 MINIMUM_STATEMENT_CLASSIFICATION_SCORE = 0.85#0.95
 MINIMUM_STATEMENT_RELATION_SCORE = 0.85#0.95
 
+# Maximum distance (in characters, between the start of each component) for a
+# pair of argumentative components of a statement to be checked by the
+# relations model. The number of pairs is quadratic on the number of
+# components, and far away components are rarely related, so this avoids
+# running the model on most of the pairs of long statements. Set it to `None`
+# to check every pair of components.
+MAXIMUM_RELATION_DISTANCE = None
+
+# Labels of the argumentative components that each label can be related to,
+# i.e., the pairs of components of a statement (source label -> target labels)
+# that are checked by the relations model. By default a premise can't be the
+# target of a relation. Removing a pair of labels (e.g., claims supporting or
+# attacking other claims) skips those pairs altogether.
+RELATION_COMPATIBLE_LABELS = {
+    "Claim": ("Claim",),
+    "Premise": ("Claim",),
+}
+
 # Careful with this as the larger the batch the more memory required
 MODELS_BATCH_SIZE = 4
+
+# Data type to load the models' weights with (e.g., "bfloat16" or "float16").
+# Half precision moves half the bytes, which makes inference notably faster on
+# GPUs and on CPUs with native support for it (e.g., AVX512-BF16/AMX), at the
+# cost of some precision. Set it to `None` to keep the weights in `float32`.
+MODELS_DTYPE = None
+
+# Device to run the models on (e.g., "cpu", "cuda:0"). Set it to `None` to use
+# the first GPU when there's one available, and the CPU otherwise.
+MODELS_DEVICE = None
+
+# Whether to quantize the linear layers of the models to `int8` (with PyTorch's
+# dynamic quantization) when they run on the CPU. It roughly halves the time
+# and the memory of the models' inference, at the cost of some accuracy (check
+# it stays acceptable for your models). It needs the weights in `float32` (i.e.,
+# `MODELS_DTYPE = None`), and the quantized layers have no gradients, so it
+# can't be used along the explanations (XAI) of the pipeline.
+MODELS_QUANTIZE = False
+
+# Mode to compile the models with `torch.compile` (e.g., "default" or
+# "reduce-overhead"). Compiling fuses the operations of the models, which makes
+# inference faster, but the first requests (and every new shape of the inputs)
+# pay for the compilation. Set it to `None` to run the models without compiling.
+# The explanations (XAI) of the pipeline aren't compatible with compiled models
+# (they hook into the embeddings of the models), so only the forward of the
+# whole models is compiled, and the explanations run their submodules without
+# compiling. Turn `MODELS_WARMUP` on along with it, so the models are
+# compiled before any explanation hooks into them.
+MODELS_COMPILE = None
+
+# Whether to load and run the models once when the WSGI server starts, so the
+# first requests don't pay for loading them and for their lazy initialization
+# (e.g., the compilation of `MODELS_COMPILE`). Each worker warms up its models.
+MODELS_WARMUP = False
+
+# Number of steps of the integrated gradients of the explanations (XAI), and
+# the number of those steps run at once. Each step is a forward and backward
+# pass of the model, so fewer steps (e.g., 20) make the explanations faster, at
+# the cost of a larger approximation error. Running the steps in smaller
+# batches bounds the memory needed for long statements. Set the batch size to
+# `None` to run all the steps at once.
+XAI_N_STEPS = 50
+XAI_INTERNAL_BATCH_SIZE = None
+
+# Cache (from the ones defined in `CACHES`) used to store the results of the
+# models, so they don't run again over the same texts, and the timeout (in
+# seconds) of those results. The results are keyed by the name of the model,
+# but not by the rest of its settings (e.g., the maximum length), so clear the
+# cache after changing those.
+MODELS_CACHE = "models"
+MODELS_CACHE_TIMEOUT = 60 * 60 * 24
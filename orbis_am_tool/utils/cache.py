@@ -0,0 +1,125 @@
+"""
+Utility module to cache the results of the models.
+"""
+
+import hashlib
+
+from concurrent.futures import Executor, Future
+from django.conf import settings
+from django.core.cache import caches
+from transformers import Pipeline
+
+
+def fingerprint(input_: str | dict[str, str]) -> str:
+    """
+    Helper function to build a fixed length key from a (possibly long) input.
+
+    Parameters
+    ----------
+    input_: str | dict[str, str]
+        The input to fingerprint. It can be a text or a pair of texts, given as
+        a dictionary with the "text" and "text_pair" keys (as expected by the
+        text classification pipelines).
+
+    Returns
+    -------
+    str
+        The hexadecimal digest of the input.
+    """
+    if isinstance(input_, dict):
+        # The texts come from the DB, which can't store the NUL character,
+        # so it's safe to use it as the separator of the pair
+        input_ = f"{input_['text']}\x00{input_['text_pair']}"
+    return hashlib.blake2b(input_.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CachedInference:
+    """
+    Runs a model over a list of inputs, reusing the cached results.
+
+    The models are deterministic, and running them is by far the most expensive
+    part of the pipeline, so the results are stored in the cache defined by the
+    ``MODELS_CACHE`` setting, with the fingerprints of the model's name and of
+    the input as the key (so changing a model doesn't reuse stale results).
+    Only the inputs that aren't cached are given to the model, and repeated
+    inputs (e.g., pairs of components with the same text) are given only once.
+
+    The model runs when the object is built, in the given executor (if any), so
+    it can run in the background. As with a future, the ``result`` method waits
+    for the model and returns the results. The cache is only read and written
+    from the thread that builds the object and calls ``result``.
+
+    Parameters
+    ----------
+    model: Pipeline
+        The Hugging Face pipeline to run.
+    inputs: list[str | dict[str, str]]
+        The list of inputs for the model.
+    key_prefix: str
+        A prefix to avoid clashes between the keys of different models.
+    executor: Executor | None
+        The executor to run the model in. If it's ``None``, the model runs
+        right away, in the current thread.
+    """
+
+    def __init__(
+        self,
+        model: Pipeline,
+        inputs: list[str | dict[str, str]],
+        key_prefix: str,
+        executor: Executor | None = None,
+    ):
+        self.cache = caches[settings.MODELS_CACHE]
+        key_prefix = f"{key_prefix}:{fingerprint(model.model.name_or_path)}"
+        self.keys = [f"{key_prefix}:{fingerprint(input_)}" for input_ in inputs]
+        self.results = self.cache.get_many(self.keys)
+
+        self.missing_inputs = {
+            key: input_ for key, input_ in zip(self.keys, inputs) if key not in self.results
+        }
+        self.missing_results = None
+        if self.missing_inputs:
+            if executor is not None:
+                self.missing_results = executor.submit(model, list(self.missing_inputs.values()))
+            else:
+                self.missing_results = Future()
+                self.missing_results.set_result(model(list(self.missing_inputs.values())))
+
+    def result(self) -> list:
+        """
+        Waits for the model (if it's still running), and returns its results.
+
+        Returns
+        -------
+        list
+            The results of the model, in the same order of the inputs.
+        """
+        if self.missing_results is not None:
+            missing_results = dict(zip(self.missing_inputs.keys(), self.missing_results.result()))
+            self.cache.set_many(missing_results, timeout=settings.MODELS_CACHE_TIMEOUT)
+            self.results.update(missing_results)
+            self.missing_results = None
+
+        return [self.results[key] for key in self.keys]
+
+
+def cached_inference(model: Pipeline, inputs: list[str | dict[str, str]], key_prefix: str) -> list:
+    """
+    Runs a model over a list of inputs, reusing the cached results (see
+    ``CachedInference``).
+
+    Parameters
+    ----------
+    model: Pipeline
+        The Hugging Face pipeline to run.
+    inputs: list[str | dict[str, str]]
+        The list of inputs for the model.
+    key_prefix: str
+        A prefix to avoid clashes between the keys of different models.
+
+    Returns
+    -------
+    list
+        The results of the model, in the same order of the inputs.
+    """
+    return CachedInference(model, inputs, key_prefix).result()
@@ -0,0 +1,22 @@
+"""
+Utility module for the converters of the URL patterns.
+"""
+
+
+class IdentifierConverter:
+    """
+    Path converter for the identifiers of the models (see
+    ``utils.django.AbstractIdentifierModel``), i.e., 16 hexadecimal digits.
+
+    It's registered as ``identifier`` in the URLs configuration of the project,
+    so the routes can use ``path`` (whose patterns are built and anchored once)
+    instead of writing the regular expression in every ``re_path``.
+    """
+
+    regex = "[0-9a-f]{16}"
+
+    def to_python(self, value: str) -> str:
+        return value
+
+    def to_url(self, value: str) -> str:
+        return value
@@ -54,3 +54,27 @@ class AbstractIdentifierModel(models.Model):
             self.identifier = self.build_identifier()
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+def get_deletion_origin_model(origin: models.Model | models.QuerySet | None) -> type | None:
+    """
+    Helper function to get the model of the ``origin`` of a ``post_delete``
+    signal, i.e., the model of the instance or the queryset whose deletion
+    started it (the other deleted instances are deleted in cascade).
+
+    Parameters
+    ----------
+    origin: models.Model | models.QuerySet | None
+        The origin of the signal. It's ``None`` for other signals (e.g.,
+        ``post_save``), which have no origin.
+
+    Returns
+    -------
+    type | None
+        The model of the origin, or ``None`` if there's no origin.
+    """
+    if isinstance(origin, models.QuerySet):
+        return origin.model
+    if isinstance(origin, models.Model):
+        return type(origin)
+    return None
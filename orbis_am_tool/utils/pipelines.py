@@ -2,48 +2,192 @@
 Hugging Face Pipelines to load the models.
 """
 
+import threading
+import torch
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from django.conf import settings
-from transformers import AutoTokenizer, pipeline
+from functools import cache
+from transformers import AutoTokenizer, Pipeline, pipeline
+
+
+class SharedExclusiveLock:
+    """
+    A lock that's either held by any number of threads at once (shared), or by
+    a single thread (exclusive). A thread waiting for the exclusive lock stops
+    new threads from taking the shared lock, so it isn't starved by them.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.shared_holders = 0
+        self.exclusive_waiters = 0
+        self.exclusive_held = False
+
+    @contextmanager
+    def shared(self):
+        with self.condition:
+            self.condition.wait_for(lambda: not (self.exclusive_held or self.exclusive_waiters))
+            self.shared_holders += 1
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.shared_holders -= 1
+                if not self.shared_holders:
+                    self.condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self.condition:
+            self.exclusive_waiters += 1
+            self.condition.wait_for(lambda: not (self.exclusive_held or self.shared_holders))
+            self.exclusive_waiters -= 1
+            self.exclusive_held = True
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.exclusive_held = False
+                self.condition.notify_all()
+
+
+# The models are shared by the threads of the process (i.e., the threads of the
+# server and the ``inference_executor``). Their inference runs at the same time
+# (under the shared lock), but the explanations (XAI) add hooks to the models,
+# which would change the results of any inference running meanwhile, so they
+# run alone (under the exclusive lock).
+models_lock = SharedExclusiveLock()
+
+
+class LockedPipeline:
+    """
+    A pipeline that runs its inference holding the shared ``models_lock``.
+    Everything else (e.g., its model or its tokenizer) is the pipeline's.
+    """
+
+    def __init__(self, model_pipeline: Pipeline):
+        self.pipeline = model_pipeline
+
+    def __call__(self, *args, **kwargs):
+        with models_lock.shared():
+            return self.pipeline(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.pipeline, name)
+
 
+@cache
+def load_pipeline(task: str, model: str, model_max_length: int, **kwargs) -> LockedPipeline:
+    """
+    Loads a Hugging Face pipeline, along with its tokenizer.
 
-arguments_components_model = pipeline(
+    Loading a model is expensive (both in time and memory), so the pipelines
+    are cached by their arguments: every part of the application that asks for
+    the same model (with the same configuration) shares a single instance in
+    the process, instead of loading it again. The weights are loaded with the
+    data type given by the ``MODELS_DTYPE`` setting, on the device given by the
+    ``MODELS_DEVICE`` setting (or the GPU, if available, when it's not set),
+    quantized to ``int8`` on the CPU if the ``MODELS_QUANTIZE`` setting is on,
+    and its forward compiled with the mode given by the ``MODELS_COMPILE``
+    setting (if any). Its inference holds the shared ``models_lock``.
+
+    Parameters
+    ----------
+    task: str
+        The Hugging Face pipeline task (e.g., "token-classification").
+    model: str
+        The name (or path) of the Hugging Face model.
+    model_max_length: int
+        The maximum length of the tokenizer of the model.
+    **kwargs
+        Extra arguments for the pipeline (e.g., ``batch_size``).
+
+    Returns
+    -------
+    LockedPipeline
+        The loaded pipeline.
+    """
+    if settings.MODELS_DEVICE is not None:
+        device = settings.MODELS_DEVICE
+    else:
+        device = "cuda:0" if torch.cuda.is_available() else "cpu"
+
+    model_pipeline = pipeline(
+        task=task,
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(model, model_max_length=model_max_length),
+        device=device,
+        torch_dtype=settings.MODELS_DTYPE,
+        **kwargs,
+    )
+
+    if settings.MODELS_QUANTIZE and model_pipeline.device.type == "cpu":
+        model_pipeline.model = torch.ao.quantization.quantize_dynamic(
+            model_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    if settings.MODELS_COMPILE is not None:
+        # Only the forward of the whole model (i.e., the pipeline's inference)
+        # is compiled. The explanations (XAI) call its submodules directly, so
+        # they keep running eagerly, along with the hooks LayerIntegratedGradients
+        # adds to the embeddings (which a compiled graph wouldn't run)
+        model_pipeline.model.forward = torch.compile(
+            model_pipeline.model.forward, mode=settings.MODELS_COMPILE
+        )
+
+    return LockedPipeline(model_pipeline)
+
+
+arguments_components_model = load_pipeline(
     task="token-classification",
     model=settings.ARGUMENTS_COMPONENTS_MODEL,
-    tokenizer=AutoTokenizer.from_pretrained(
-        settings.ARGUMENTS_COMPONENTS_MODEL,
-        model_max_length=settings.ARGUMENTS_COMPONENT_MODEL_MAX_LENGTH,
-    ),
+    model_max_length=settings.ARGUMENTS_COMPONENT_MODEL_MAX_LENGTH,
     aggregation_strategy=settings.ARGUMENTS_COMPONENT_MODEL_STRATEGY,
     stride=settings.ARGUMENTS_COMPONENT_MODEL_STRIDE,
     batch_size=settings.MODELS_BATCH_SIZE,
 )
 
-arguments_relations_model = pipeline(
+arguments_relations_model = load_pipeline(
     task="text-classification",
     model=settings.ARGUMENTS_RELATIONS_MODEL,
-    tokenizer=AutoTokenizer.from_pretrained(
-        settings.ARGUMENTS_RELATIONS_MODEL,
-        model_max_length=settings.ARGUMENTS_RELATIONS_MODEL_MAX_LENGTH,
-    ),
-    batch_size=settings.MODELS_BATCH_SIZE,
+    model_max_length=settings.ARGUMENTS_RELATIONS_MODEL_MAX_LENGTH,
+    batch_size=settings.ARGUMENTS_RELATIONS_MODEL_BATCH_SIZE,
 )
 
-statements_classification_model = pipeline(
+statements_classification_model = load_pipeline(
     task="text-classification",
     model=settings.STATEMENTS_CLASSIFICATION_MODEL,
-    tokenizer=AutoTokenizer.from_pretrained(
-        settings.STATEMENTS_CLASSIFICATION_MODEL,
-        model_max_length=settings.STATEMENTS_CLASSIFICATION_MODEL_MAX_LENGTH,
-    ),
+    model_max_length=settings.STATEMENTS_CLASSIFICATION_MODEL_MAX_LENGTH,
     batch_size=settings.MODELS_BATCH_SIZE,
 )
 
-statements_relations_model = pipeline(
+statements_relations_model = load_pipeline(
     task="text-classification",
     model=settings.STATEMENTS_RELATIONS_MODEL,
-    tokenizer=AutoTokenizer.from_pretrained(
-        settings.STATEMENTS_RELATIONS_MODEL,
-        model_max_length=settings.STATEMENTS_RELATIONS_MODEL_MAX_LENGTH,
-    ),
+    model_max_length=settings.STATEMENTS_RELATIONS_MODEL_MAX_LENGTH,
     batch_size=settings.MODELS_BATCH_SIZE,
 )
+
+# Pool of threads to run models in the background, while other models run. The
+# heavy work of PyTorch releases the GIL, so the models do run at the same time.
+inference_executor = ThreadPoolExecutor(thread_name_prefix="inference")
+
+
+def warm_up():
+    """
+    Runs every model once, over a full batch of a short input.
+
+    The first inference of a model pays for its lazy initialization (e.g., the
+    compilation when the ``MODELS_COMPILE`` setting is set, or the CUDA kernels
+    and memory allocations), so running it when the server starts (see the
+    ``MODELS_WARMUP`` setting) spares that cost to the first requests.
+    """
+    text = "This is a warm up statement."
+    text_pair = {"text": text, "text_pair": text}
+
+    arguments_components_model([text] * settings.MODELS_BATCH_SIZE)
+    arguments_relations_model([text_pair] * settings.ARGUMENTS_RELATIONS_MODEL_BATCH_SIZE)
+    statements_classification_model([text] * settings.MODELS_BATCH_SIZE)
+    statements_relations_model([text_pair] * settings.MODELS_BATCH_SIZE)
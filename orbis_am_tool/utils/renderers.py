@@ -0,0 +1,40 @@
+"""
+Utility module with the renderers of the REST API.
+
+It's kept apart from ``utils.rest``, as the renderers are loaded by DRF's
+settings, which can't import the views (i.e., it'd be a circular import).
+"""
+
+import orjson
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+
+class OrjsonRenderer(renderers.JSONRenderer):
+    """
+    A ``JSONRenderer`` that encodes the data with ``orjson``, which is much
+    faster than the standard library's ``json`` for the large responses of the
+    API (e.g., the components and relations of a whole debate).
+
+    The types ``orjson`` doesn't know (e.g., lazy strings, decimals) are
+    encoded with DRF's encoder. The only indentation ``orjson`` supports is of
+    2 spaces, so any requested indentation renders with 2 spaces.
+    """
+
+    # orjson has no separators option, its output is always compact
+    compact = True
+    encoder_default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self.encoder_default, option=options)
+
+        # Same as DRF, escape the line and paragraph separators, as they're
+        # valid in JSON strings, but not in JavaScript strings
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
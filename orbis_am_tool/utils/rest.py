@@ -0,0 +1,427 @@
+"""
+Utility module for Django REST Framework related things.
+"""
+
+import copy
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.urls import get_script_prefix
+from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
+from functools import cache
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+from types import MappingProxyType
+
+# A valid identifier (i.e., one that matches the URL patterns) to build the
+# templates of the URLs
+IDENTIFIER_PLACEHOLDER = "f" * 16
+
+# Values of the boolean query parameters (once lowercased) that are taken as true
+TRUE_VALUES = frozenset({"true", "1"})
+
+# Query parameter to select the fields of the response (see `DynamicFieldsMixin`)
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Comma separated list of the fields to include in the response. "
+        "If it's not given, the response has all the fields."
+    ),
+)
+
+
+def _build_relations_tree(
+    serializer: serializers.BaseSerializer, model: type[models.Model], tree: dict
+) -> dict:
+    """
+    Helper function to collect the model relations a serializer goes through.
+
+    Parameters
+    ----------
+    serializer: serializers.BaseSerializer
+        The serializer to inspect.
+    model: type[models.Model]
+        The model the serializer represents.
+    tree: dict
+        The tree to add the relations to.
+
+    Returns
+    -------
+    dict
+        A tree of the relations, where each key is the name of a relation, and
+        its value is a list with the relation's field, the subtree of the
+        relations of the related model, and whether the related objects are
+        only used for their hyperlinks (i.e., their ``identifier``).
+    """
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        node, related_model, parent = tree, model, None
+        for attr in field.source_attrs:
+            try:
+                model_field = related_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or a method of the model, nothing to fetch
+                break
+            if not model_field.is_relation:
+                break
+            if parent is not None:
+                parent[2] = False  # The relation is followed, not only linked
+            related_model = model_field.related_model
+            parent = node.setdefault(attr, [model_field, {}, True])
+            node = parent[1]
+        else:
+            # The whole source is a relation, and if the field is a nested
+            # serializer, its own relations are also needed
+            nested_serializer = getattr(field, "child", field)
+            if isinstance(nested_serializer, serializers.BaseSerializer):
+                _build_relations_tree(nested_serializer, related_model, node)
+            if not isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField)):
+                parent[2] = False
+            continue
+
+        if parent is not None:
+            # The source goes through the relation to some attribute of it
+            parent[2] = False
+
+    return tree
+
+
+def _build_related_lookups(
+    tree: dict, prefix: str = ""
+) -> tuple[list[str], list[models.Prefetch], list[str]]:
+    """
+    Helper function to turn a tree of relations into lookups for a queryset.
+
+    The "to-one" relations are joined with ``select_related``, while the
+    "to-many" relations are fetched with a ``Prefetch``, whose queryset has in
+    turn the lookups for the relations of the related model. The relations that
+    are only used for their hyperlinks fetch only the ``identifier`` (and the
+    keys to join them) of the related objects, or, for the "to-one" relations,
+    everything but their JSON columns (which can be rather large, and the
+    model's properties never use them). The relation back to the object
+    of a "to-many" relation isn't joined, as Django already sets it to the
+    object the related objects are prefetched for.
+
+    Parameters
+    ----------
+    tree: dict
+        The tree of relations, as returned by ``_build_relations_tree``.
+    prefix: str
+        The prefix of the lookups (for relations reached via "to-one" relations).
+
+    Returns
+    -------
+    tuple[list[str], list[models.Prefetch], list[str]]
+        The lookups for the ``select_related``, ``prefetch_related`` and
+        ``defer`` methods.
+    """
+    select_related, prefetch_related, deferred = [], [], []
+    for attr, (model_field, subtree, links_only) in tree.items():
+        if model_field.one_to_many or model_field.many_to_many:
+            queryset = model_field.related_model._default_manager.all()
+            if links_only and model_field.one_to_many:
+                queryset = queryset.only("identifier", model_field.field.name)
+            elif links_only:
+                queryset = queryset.only("identifier")
+            if model_field.one_to_many:
+                back_field, back_subtree, back_links_only = subtree.get(
+                    model_field.field.name, (None, None, False)
+                )
+                if back_links_only and not back_subtree:
+                    subtree = {key: node for key, node in subtree.items() if node[0] != back_field}
+            related_select, related_prefetch, related_deferred = _build_related_lookups(subtree)
+            if related_select:  # Empty `select_related()` would follow every relation
+                queryset = queryset.select_related(*related_select)
+            if related_prefetch:
+                queryset = queryset.prefetch_related(*related_prefetch)
+            if related_deferred:
+                queryset = queryset.defer(*related_deferred)
+            prefetch_related.append(models.Prefetch(f"{prefix}{attr}", queryset=queryset))
+        else:
+            select_related.append(f"{prefix}{attr}")
+            if links_only:
+                deferred.extend(
+                    f"{prefix}{attr}__{field.name}"
+                    for field in model_field.related_model._meta.concrete_fields
+                    if isinstance(field, models.JSONField)
+                )
+            related_select, related_prefetch, related_deferred = _build_related_lookups(
+                subtree, f"{prefix}{attr}__"
+            )
+            select_related.extend(related_select)
+            prefetch_related.extend(related_prefetch)
+            deferred.extend(related_deferred)
+
+    return select_related, prefetch_related, deferred
+
+
+def get_related_lookups(
+    serializer: serializers.ModelSerializer,
+) -> tuple[list[str], list[models.Prefetch], list[str]]:
+    """
+    Gets the lookups to fetch all the related objects a serializer needs.
+
+    It goes through the fields of the serializer (and its nested serializers),
+    and finds those that are sourced from a relation of the model, so they can
+    be fetched along the serialized objects, instead of one by one.
+
+    Parameters
+    ----------
+    serializer: serializers.ModelSerializer
+        The serializer to inspect.
+
+    Returns
+    -------
+    tuple[list[str], list[models.Prefetch], list[str]]
+        The lookups for the ``select_related``, ``prefetch_related`` and
+        ``defer`` methods.
+    """
+    serializer = getattr(serializer, "child", serializer)
+    return _build_related_lookups(_build_relations_tree(serializer, serializer.Meta.model, {}))
+
+
+@cache
+def get_choices_display(model: type[models.Model], field_name: str) -> MappingProxyType:
+    """
+    Gets the mapping from the values of a model field with choices to their
+    display values (i.e., the "human readable" labels).
+
+    The choices of a model are fixed, so the mapping is built only once per
+    field, and shared by every request.
+
+    Parameters
+    ----------
+    model: type[models.Model]
+        The model of the field.
+    field_name: str
+        The name of the field with choices.
+
+    Returns
+    -------
+    MappingProxyType
+        The read-only mapping from the values to their display values.
+    """
+    return MappingProxyType(dict(model._meta.get_field(field_name).flatchoices))
+
+
+class ChoiceDisplayField(serializers.CharField):
+    """
+    A field that renders the display value (i.e., the "human readable" label)
+    of a model field with choices, the same as the model's ``get_FOO_display``
+    method, but with the mapping of the choices built only once (see
+    ``get_choices_display``), instead of for each rendered object.
+    """
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        self.choices_display = get_choices_display(parent.Meta.model, self.source)
+
+    def to_representation(self, value):
+        return self.choices_display.get(value, value)
+
+
+def get_unused_json_fields(serializer: serializers.ModelSerializer) -> list[str]:
+    """
+    Gets the JSON fields of the serializer's model that the serializer doesn't
+    render (e.g., the XAI attributions, which can be rather large).
+
+    Parameters
+    ----------
+    serializer: serializers.ModelSerializer
+        The serializer to inspect.
+
+    Returns
+    -------
+    list[str]
+        The names of the JSON fields of the model that can be deferred.
+    """
+    serializer = getattr(serializer, "child", serializer)
+    sources = {field.source_attrs[0] for field in serializer.fields.values() if field.source_attrs}
+    return [
+        field.name
+        for field in serializer.Meta.model._meta.concrete_fields
+        if isinstance(field, models.JSONField) and field.name not in sources
+    ]
+
+
+class AutoPrefetchMixin:
+    """
+    Mixin for DRF's generic views to fetch the related objects of the model
+    that are part of the serializer, to avoid running queries for each of them.
+    The JSON columns of the model that aren't part of the serializer aren't
+    fetched.
+
+    The lookups are derived from the serializer, so they're kept up to date
+    with the serializer's fields.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer = self.get_serializer()
+        select_related, prefetch_related, deferred = get_related_lookups(serializer)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        deferred.extend(get_unused_json_fields(serializer))
+        if deferred:
+            queryset = queryset.defer(*deferred)
+        return queryset
+
+
+class CachedFieldsMixin:
+    """
+    Mixin for model serializers to build their fields only once per class.
+
+    A ``ModelSerializer`` builds its fields by going through the model's fields
+    and their options every time it's instantiated (i.e., at least once per
+    request, and once per nested serializer). The fields only depend on the
+    class of the serializer, so they're built once and copied afterwards, as
+    each serializer instance binds its own copy of the fields.
+    """
+
+    _fields_cache = {}
+
+    def get_fields(self):
+        serializer_class = type(self)
+        if serializer_class not in self._fields_cache:
+            # Read-only, as the cached fields are shared by every instance
+            self._fields_cache[serializer_class] = MappingProxyType(super().get_fields())
+        return {
+            field_name: copy.deepcopy(field)
+            for field_name, field in self._fields_cache[serializer_class].items()
+        }
+
+
+class DynamicFieldsMixin:
+    """
+    Mixin for serializers to only render the fields given (as a comma separated
+    list) in the ``fields`` query parameter of the request.
+
+    It only applies to the serializer of the view (i.e., not to the nested
+    serializers). Combined with the ``AutoPrefetchMixin`` on the view, the
+    relations of the fields that aren't requested aren't fetched either.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or self.root not in (self, self.parent):
+            return fields
+
+        requested_fields = request.query_params.get(FIELDS_PARAMETER.name)
+        if not requested_fields:
+            return fields
+
+        requested_fields = {field_name.strip() for field_name in requested_fields.split(",")}
+        return {
+            field_name: field
+            for field_name, field in fields.items()
+            if field_name in requested_fields
+        }
+
+
+@cache
+def get_url_template(view_name: str, script_prefix: str) -> tuple[str, str]:
+    """
+    Gets the template to build the URLs of a view that looks up by identifier.
+
+    Reversing a URL goes through the whole URL resolver, which is rather slow
+    when done for every related object of a response, so the URL is only
+    reversed once (with a placeholder identifier) and split in the parts that
+    go before and after the identifier.
+
+    Parameters
+    ----------
+    view_name: str
+        The name of the view (with its namespace).
+    script_prefix: str
+        The script prefix of the URLs. It's not used directly, it's part of the
+        arguments to cache a different template for each prefix.
+
+    Returns
+    -------
+    tuple[str, str]
+        The parts of the URL before and after the identifier.
+    """
+    url = reverse(view_name, kwargs={"identifier": IDENTIFIER_PLACEHOLDER})
+    prefix, _, suffix = url.rpartition(IDENTIFIER_PLACEHOLDER)
+    return prefix, suffix
+
+
+def get_absolute_url_template(view_name: str, request=None) -> tuple[str, str]:
+    """
+    Gets the template to build the absolute URLs of a view for a request.
+
+    It's the same as ``get_url_template``, but reversing the URL along the
+    request (so it's done once per request), as DRF does, i.e., with the host,
+    the versioning and the format override query parameter of the request.
+
+    Parameters
+    ----------
+    view_name: str
+        The name of the view (with its namespace).
+    request: rest_framework.request.Request | None
+        The request the URLs are built for. If it's not given the URLs are
+        relative.
+
+    Returns
+    -------
+    tuple[str, str]
+        The parts of the URL before and after the identifier.
+    """
+    if request is None:
+        return get_url_template(view_name, get_script_prefix())
+
+    url = reverse(view_name, kwargs={"identifier": IDENTIFIER_PLACEHOLDER}, request=request)
+    prefix, _, suffix = url.rpartition(IDENTIFIER_PLACEHOLDER)
+    return prefix, suffix
+
+
+class IdentifierHyperlinkMixin:
+    """
+    Mixin for DRF's hyperlinked fields that builds the URLs from a template
+    (see ``get_absolute_url_template``), when the lookup field is the
+    ``identifier``. It falls back to DRF's way for format suffixes.
+
+    The template is resolved once per request, and kept in the field (the same
+    field renders the related objects of every serialized object of the
+    request), so every URL is only a string formatting.
+    """
+
+    _template_request = object()  # Sentinel, as a request can be `None`
+
+    def get_url(self, obj, view_name, request, format):
+        if self.lookup_field != "identifier" or format is not None:
+            return super().get_url(obj, view_name, request, format)
+
+        # Unsaved objects will not yet have a valid URL
+        if obj.pk is None:
+            return None
+
+        if self._template_request is not request:
+            self._template = get_absolute_url_template(view_name, request)
+            self._template_request = request
+
+        prefix, suffix = self._template
+        return f"{prefix}{obj.identifier}{suffix}"
+
+
+class IdentifierHyperlinkedRelatedField(
+    IdentifierHyperlinkMixin, serializers.HyperlinkedRelatedField
+):
+    """
+    A ``HyperlinkedRelatedField`` that builds the URLs from a template.
+    """
+
+
+class IdentifierHyperlinkedIdentityField(
+    IdentifierHyperlinkMixin, serializers.HyperlinkedIdentityField
+):
+    """
+    A ``HyperlinkedIdentityField`` that builds the URLs from a template.
+    """
@@ -0,0 +1,34 @@
+"""
+Utility module for text related things.
+"""
+
+import re
+import unicodedata
+
+NON_SLUG_CHARACTERS_REGEX = re.compile(r"[^\w\s-]")
+SLUG_SEPARATORS_REGEX = re.compile(r"[-\s]+")
+
+
+def slugify(value: str) -> str:
+    """
+    Faster version of Django's ``django.utils.text.slugify``.
+
+    The slugs are part of the identifiers stored in the DB, so this gives
+    exactly the same result as Django's version (with ``allow_unicode=False``),
+    but it skips the unicode normalization for ASCII texts (the most common
+    case), as well as the overhead of Django's lazy text wrapper.
+
+    Parameters
+    ----------
+    value: str
+        The text to slugify.
+
+    Returns
+    -------
+    str
+        The slug of the text.
+    """
+    if not value.isascii():
+        value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    value = NON_SLUG_CHARACTERS_REGEX.sub("", value.lower())
+    return SLUG_SEPARATORS_REGEX.sub("-", value).strip("-_")